@@ -0,0 +1,171 @@
+"""
+Offline benchmarks for the core USB paths, run against SimulatedTransport.
+
+    python -m benchmarks.bench_core [--json] [--iterations N]
+
+Each scenario reports control transfers per operation, simulated device
+time per operation (virtual clock, nothing sleeps) and host CPU time per
+operation. Exits non-zero when a scenario goes over its budget, so a
+regression in round trips or overhead shows up on any Linux box without
+an interface attached.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from core import protocol
+from core.device_manager import DeviceManager
+from core.devices import US4X4
+from core.parameters import state_values
+from core.read_state import read_state
+from core.simulation import SimulatedTransport
+from core.write_queue import WriteQueue
+
+
+@dataclass(frozen=True)
+class Budget:
+    transfers: float      # per operation, upper bound
+    cpu_ms: float         # host overhead per operation, upper bound
+
+
+BUDGETS: dict[str, Budget] = {
+    "read_state": Budget(transfers=11, cpu_ms=1.0),
+    # +1 for the rejected probe on the first snapshot, before the fallback sticks
+    "read_state (prep per read)": Budget(transfers=28, cpu_ms=2.0),
+    "write (one parameter)": Budget(transfers=3, cpu_ms=0.5),
+    "connect + disconnect": Budget(transfers=0, cpu_ms=1.0),
+    "apply profile (9 changes, verified)": Budget(transfers=22, cpu_ms=2.0),
+    "apply profile (no-op)": Budget(transfers=0, cpu_ms=0.5),
+    "poll tick (sentinel)": Budget(transfers=3, cpu_ms=0.5),
+    # 100 values for two keys collapse into one verified two-parameter apply
+    "input burst (100 values, coalesced)": Budget(transfers=8, cpu_ms=2.0),
+}
+
+
+@dataclass
+class Result:
+    name: str
+    transfers: float
+    device_ms: float
+    cpu_ms: float
+    over_budget: bool = False
+
+
+def _sim(**kwargs) -> SimulatedTransport:
+    return SimulatedTransport(realtime=False, **kwargs)
+
+
+def _measure(name: str, sim: SimulatedTransport, op: Callable[[], object], iterations: int) -> Result:
+    sim.reset_counters()
+    start = time.process_time()
+    for _ in range(iterations):
+        op()
+    cpu = time.process_time() - start
+
+    result = Result(
+        name=name,
+        transfers=sim.transfers / iterations,
+        device_ms=sim.clock_s * 1000 / iterations,
+        cpu_ms=cpu * 1000 / iterations,
+    )
+    budget = BUDGETS.get(name)
+    if budget is not None:
+        result.over_budget = result.transfers > budget.transfers or result.cpu_ms > budget.cpu_ms
+    return result
+
+
+def _manager(sim: SimulatedTransport) -> DeviceManager:
+    return DeviceManager(US4X4, transport_factory=lambda: sim)
+
+
+def run(iterations: int) -> list[Result]:
+    results: list[Result] = []
+
+    sim = _sim()
+    sim.open()
+    results.append(_measure("read_state", sim, lambda: read_state(sim), iterations))
+
+    sim = _sim(requires_prep=True)
+    sim.open()
+    results.append(_measure("read_state (prep per read)", sim, lambda: read_state(sim), iterations))
+
+    sim = _sim()
+    sim.open()
+    results.append(_measure("write (one parameter)", sim, lambda: protocol.set_routing(sim, 1, 2), iterations))
+
+    sim = _sim()
+    dm = _manager(sim)
+
+    def connect_cycle() -> None:
+        dm.connect()
+        dm.disconnect()
+
+    results.append(_measure("connect + disconnect", sim, connect_cycle, iterations))
+
+    sim = _sim()
+    dm = _manager(sim)
+    dm.connect()
+    dm.read_state()
+    profiles = [
+        {"LINE12": 1, "LINE34": 2, "IN12": 1, "IN34": 1, "IN1": 1, "IN2": 1, "IN3": 1, "IN4": 1, "POWERSAVE": 1},
+        {"LINE12": 0, "LINE34": 0, "IN12": 0, "IN34": 0, "IN1": 0, "IN2": 0, "IN3": 0, "IN4": 0, "POWERSAVE": 0},
+    ]
+    flip = iter(range(10 ** 9))
+    results.append(_measure(
+        "apply profile (9 changes, verified)", sim,
+        lambda: dm.apply(profiles[next(flip) % 2]), iterations,
+    ))
+    current = state_values(dm.state)
+    results.append(_measure("apply profile (no-op)", sim, lambda: dm.apply(current), iterations))
+
+    results.append(_measure("poll tick (sentinel)", sim, lambda: dm.read_param("POWERSAVE"), iterations))
+
+    # Debounce long enough that only the explicit flush writes
+    queue = WriteQueue(dm, debounce=60.0, max_delay=60.0)
+
+    def input_burst() -> None:
+        start = next(flip)
+        for n in range(50):
+            queue.submit("LINE12", (start + n) % 3)
+            queue.submit("IN3", (start + n) % 2)
+        queue.flush()
+
+    results.append(_measure("input burst (100 values, coalesced)", sim, input_burst, iterations))
+    queue.close()
+    dm.disconnect()
+
+    return results
+
+
+def format_results(results: list[Result]) -> str:
+    header = f"{'scenario':<38}{'transfers':>10}{'device ms':>11}{'cpu ms':>9}  budget"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        budget = BUDGETS.get(r.name)
+        verdict = "-" if budget is None else ("OVER" if r.over_budget else "ok")
+        lines.append(f"{r.name:<38}{r.transfers:>10.1f}{r.device_ms:>11.2f}{r.cpu_ms:>9.3f}  {verdict}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations)
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(format_results(results))
+
+    return 1 if any(r.over_budget for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+"""
+Cold-start benchmark for the GUI on Qt's offscreen platform.
+
+    python -m benchmarks.bench_gui_startup [--json] [--runs N]
+
+Each run starts a fresh interpreter that builds MainWindow and shows it
+with QT_QPA_PLATFORM=offscreen, so it needs PySide6 but no display. USB
+detection is stubbed out to time the GUI rather than the bus. Reports
+time from process start to the first painted frame, the window build
+time, and resident memory at the first frame and once startup has
+settled (the deferred stylesheet applied, background work done). Exits
+non-zero when the median run goes over budget.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# How long to keep the window up after the first frame before sampling again
+SETTLE_MS = 500
+
+_CHILD = f"""
+import json, os, resource, sys, time
+
+start = float(os.environ["BENCH_T0"])
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+import gui.main_window as main_window
+from gui.app import apply_stylesheet
+
+main_window.detect_devices = lambda *args, **kwargs: []
+main_window.detect_at_path = lambda *args, **kwargs: None
+
+app = QApplication(sys.argv)
+window = main_window.MainWindow()
+result = {{"window_ms": (time.time() - start) * 1000}}
+
+def finish():
+    result["rss_settled_mb"] = rss_mb()
+    result["tabs_built"] = sum(window.left.tabs.is_built(i) for i in range(window.left.tabs.stack.count()))
+    print(json.dumps(result))
+    window.close()
+    app.quit()
+
+def on_first_frame():
+    result["first_frame_ms"] = (time.time() - start) * 1000
+    result["rss_first_frame_mb"] = rss_mb()
+    QTimer.singleShot(0, lambda: apply_stylesheet(app))
+    QTimer.singleShot({SETTLE_MS}, finish)
+
+window.first_painted.connect(on_first_frame)
+window.show()
+app.exec()
+"""
+
+
+@dataclass(frozen=True)
+class Budget:
+    first_frame_ms: float
+    rss_settled_mb: float
+
+
+BUDGET = Budget(first_frame_ms=1500.0, rss_settled_mb=200.0)
+
+
+@dataclass
+class Result:
+    first_frame_ms: float
+    window_ms: float
+    rss_first_frame_mb: float
+    rss_settled_mb: float
+    tabs_built: int
+    over_budget: bool = False
+
+
+def _run_once() -> dict:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", BENCH_T0=repr(time.time()))
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "GUI process failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int) -> Result:
+    """Median of each metric over `runs` cold starts."""
+    samples = [_run_once() for _ in range(runs)]
+    result = Result(**{
+        name: statistics.median(s[name] for s in samples)
+        for name in ("first_frame_ms", "window_ms", "rss_first_frame_mb", "rss_settled_mb", "tabs_built")
+    })
+    result.over_budget = (
+        result.first_frame_ms > BUDGET.first_frame_ms or result.rss_settled_mb > BUDGET.rss_settled_mb
+    )
+    return result
+
+
+def format_result(r: Result) -> str:
+    return "\n".join([
+        f"time to first frame   {r.first_frame_ms:8.1f} ms  (budget {BUDGET.first_frame_ms:.0f})",
+        f"window built          {r.window_ms:8.1f} ms",
+        f"RSS at first frame    {r.rss_first_frame_mb:8.1f} MB",
+        f"RSS settled           {r.rss_settled_mb:8.1f} MB  (budget {BUDGET.rss_settled_mb:.0f})",
+        f"tabs built            {r.tabs_built:8.0f}",
+        "OVER BUDGET" if r.over_budget else "ok",
+    ])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run(args.runs)
+    except RuntimeError as e:
+        print(f"GUI benchmark could not run: {e}", file=sys.stderr)
+        return 2
+
+    print(json.dumps(asdict(result), indent=2) if args.json else format_result(result))
+    return 1 if result.over_budget else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+"""
+Startup-time benchmarks for the CLI, each scenario in a fresh interpreter.
+
+    python -m benchmarks.bench_startup [--json] [--runs N]
+
+Reports wall time per scenario as the best of N runs, minus a bare
+``python -c pass`` so the numbers track our own import work rather than
+the interpreter. Also checks that the first transfer happens without
+PyUSB or asyncio loaded. Exits non-zero when a scenario goes over its
+budget.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / "tascam-util.py"
+
+# Modules the CLI must not import until it actually needs them
+HEAVY_MODULES = ("usb", "asyncio", "PySide6")
+
+# Load tascam-util.py as a module and run one read against a simulated unit,
+# the same path a CLI call takes once it holds a device.
+_FIRST_TRANSFER = f"""
+import importlib.util, json, sys
+spec = importlib.util.spec_from_file_location("tascam_util", {str(CLI)!r})
+cli = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cli)
+from core.simulation import SimulatedTransport
+from core.transport import TransportDevice
+sim = SimulatedTransport(realtime=False)
+sim.open()
+cli.get_command("read", ["-c", "POWERSAVE"]).execute(TransportDevice(sim))
+print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))
+"""
+
+SCENARIOS: dict[str, list[str]] = {
+    "--help": [str(CLI), "--help"],
+    "import cli": ["-c", f"import runpy; runpy.run_path({str(CLI)!r})"],
+    "first transfer (simulated)": ["-c", _FIRST_TRANSFER],
+}
+
+# Milliseconds over a bare interpreter, upper bound
+BUDGETS_MS: dict[str, float] = {
+    "--help": 80.0,
+    "import cli": 70.0,
+    "first transfer (simulated)": 80.0,
+}
+
+
+@dataclass
+class Result:
+    name: str
+    wall_ms: float
+    over_baseline_ms: float
+    over_budget: bool = False
+
+
+def _time(args: list[str], runs: int) -> tuple[float, str]:
+    best = float("inf")
+    out = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+        out = proc.stdout
+    return best * 1000, out
+
+
+def run(runs: int) -> tuple[list[Result], list[str]]:
+    """Results per scenario, and the heavy modules the first transfer pulled in."""
+    baseline_ms, _ = _time(["-c", "pass"], runs)
+    results: list[Result] = []
+    heavy: list[str] = []
+    for name, args in SCENARIOS.items():
+        wall_ms, out = _time(args, runs)
+        result = Result(name, wall_ms, wall_ms - baseline_ms)
+        result.over_budget = result.over_baseline_ms > BUDGETS_MS[name]
+        if name.startswith("first transfer"):
+            heavy = json.loads(out.strip().splitlines()[-1])
+        results.append(result)
+    return results, heavy
+
+
+def format_results(results: list[Result], heavy: list[str]) -> str:
+    header = f"{'scenario':<30}{'wall ms':>9}{'+ms':>8}  budget"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        verdict = "OVER" if r.over_budget else "ok"
+        lines.append(f"{r.name:<30}{r.wall_ms:>9.1f}{r.over_baseline_ms:>8.1f}  {verdict}")
+    lines.append(f"heavy modules before first transfer: {', '.join(heavy) or 'none'}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--runs", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results, heavy = run(args.runs)
+    if args.json:
+        print(json.dumps({"results": [asdict(r) for r in results], "heavy_modules": heavy}, indent=2))
+    else:
+        print(format_results(results, heavy))
+
+    return 1 if heavy or any(r.over_budget for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
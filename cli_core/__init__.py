@@ -0,0 +1,28 @@
+"""
+Command-line commands for the US4x4, one module per command
+"""
+import importlib
+
+# Command name -> (module, class). Modules are imported only for the command
+# that runs, and PyUSB only once a real device is opened, so --help and daemon
+# round trips don't pay for either.
+COMMANDS = {
+    "route": ("cli_core.route", "RouteCommand"),
+    "monitor": ("cli_core.monitor", "MonitorCommand"),
+    "input": ("cli_core.inputs", "InputCommand"),
+    "powersave": ("cli_core.powersave", "PowersaveCommand"),
+    "read": ("cli_core.read", "ReadCommand"),
+    "stats": ("cli_core.stats", "StatsCommand"),
+    "batch": ("cli_core.batch", "BatchCommand"),
+}
+
+
+def get_command_class(command):
+    """
+    Imports and returns the command class registered under the given name
+    """
+    try:
+        module_name, class_name = COMMANDS[command.lower()]
+    except KeyError:
+        raise ValueError('Unknown command') from None
+    return getattr(importlib.import_module(module_name), class_name)
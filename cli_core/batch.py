@@ -0,0 +1,145 @@
+"""
+This module contains a command to run many commands under one device claim
+"""
+import argparse
+import contextlib
+import io
+import json
+import shlex
+import sys
+
+from cli_core import get_command_class
+from core import protocol
+from core.transport import PyUsbTransport, TransportDevice, TransportError
+
+
+def parse_script(lines):
+    """
+    Turns script lines into (line number, text, command) entries, and
+    collects a message for every line that does not parse. Blank lines and
+    lines starting with # are skipped. Only commands that can describe their
+    transfers (writes() or reads()) are allowed.
+    """
+    entries = []
+    errors = []
+    for number, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+
+        stderr = io.StringIO()
+        try:
+            name, *args = shlex.split(text)
+            command_class = get_command_class(name)
+            if not hasattr(command_class, "writes") and not hasattr(command_class, "reads"):
+                raise ValueError(f"'{name}' cannot be used in a batch")
+            with contextlib.redirect_stderr(stderr):
+                command = command_class(args)
+        except SystemExit:
+            # argparse already explained itself on stderr; keep the last line
+            message = (stderr.getvalue().strip().splitlines() or ["invalid arguments"])[-1]
+            errors.append((number, text, message))
+            continue
+        except Exception as err:
+            errors.append((number, text, str(err) or type(err).__name__))
+            continue
+        entries.append((number, text, command))
+    return entries, errors
+
+
+def _runs(entries):
+    """
+    Groups consecutive entries of the same kind, so each run of writes or
+    reads goes out with one shared prep handshake
+    """
+    runs = []
+    for entry in entries:
+        kind = "writes" if hasattr(entry[2], "writes") else "reads"
+        if runs and runs[-1][0] == kind:
+            runs[-1][1].append(entry)
+        else:
+            runs.append((kind, [entry]))
+    return runs
+
+
+def run_script(transport, entries):
+    """
+    Runs parsed entries back to back on one open transport and returns a
+    result dict per entry. After a transfer error the remaining entries are
+    reported as skipped, since the device state is no longer known.
+    """
+    results = []
+    failed = None
+    for kind, run in _runs(entries):
+        if failed is not None:
+            results.extend(_result(number, text, "skipped") for number, text, _ in run)
+            continue
+
+        try:
+            if kind == "writes":
+                protocol.write_bytes(transport, [w for _, _, command in run for w in command.writes()])
+                results.extend(_result(number, text, "ok") for number, text, _ in run)
+            else:
+                params = [p for _, _, command in run for p in command.reads()]
+                values = iter(protocol.read_bytes(transport, params))
+                for number, text, command in run:
+                    own = [next(values) for _ in command.reads()]
+                    results.append(_result(number, text, "ok", values=command.results(own)))
+        except TransportError as err:
+            # Writes in a failed run may have partly landed; say so for all of them
+            failed = str(err) or type(err).__name__
+            results.extend(_result(number, text, "error", error=failed) for number, text, _ in run)
+    return results
+
+
+def _result(line, command, status, **extra):
+    return {"line": line, "command": command, "status": status, **extra}
+
+
+class BatchCommand:
+    """
+    Runs many commands, one per line of a file or stdin, under one claim of
+    the device. Every line is validated before the device is touched; results
+    are printed as one JSON object per command.
+    """
+    def __init__(self, args):
+        """
+        Constructor. Reads and validates the whole script, so a typo on the
+        last line fails before anything is sent to the device
+        """
+        parser = argparse.ArgumentParser()
+        parser.add_argument("-f", "--file", type=str, default="-", help="Script to run, one command per line (default: stdin)")
+        parser.add_argument("-o", "--output", type=str, default="-", help="Where to write the JSON results (default: stdout)")
+        args = parser.parse_args(args)
+
+        if args.file == "-":
+            lines = sys.stdin.readlines()
+        else:
+            with open(args.file, encoding="utf-8") as script:
+                lines = script.readlines()
+
+        self.output = args.output
+        self.entries, errors = parse_script(lines)
+        if errors:
+            self._emit(_result(number, text, "invalid", error=message) for number, text, message in errors)
+            raise SystemExit(2)
+
+    def _emit(self, results):
+        with contextlib.ExitStack() as stack:
+            out = sys.stdout if self.output == "-" else stack.enter_context(open(self.output, "w", encoding="utf-8"))
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+
+    def execute(self, device):
+        """
+        Runs the script and prints the results; exits non-zero if any command failed
+        """
+        if isinstance(device, TransportDevice):
+            transport = device.transport
+        else:
+            transport = PyUsbTransport.from_device(device)
+
+        results = run_script(transport, self.entries)
+        self._emit(results)
+        if any(result["status"] != "ok" for result in results):
+            raise SystemExit(1)
@@ -4,30 +4,20 @@ the US4x4 interface
 """
 import argparse
 
-INPUT_IN1 = 0x0000
-INPUT_IN2 = 0x0001
-INPUT_IN3 = 0x0002
-INPUT_IN4 = 0x0003
+from core.parameters import DEFAULT_SCHEMA
 
+INPUTS = DEFAULT_SCHEMA.group("INPUT")
 
-MODE_OFF = 0x0000
-MODE_ON = 0x0001
 
 def get_input_index(input_name):
     """
-    Take a named input pair, and return the correct index for the USB 
+    Take a named input, and return the correct index for the USB 
     control transfer instruction
     """
-    if input_name.upper() == "IN 1":
-        return INPUT_IN1
-    elif input_name.upper() == "IN 2":
-        return INPUT_IN2
-    elif input_name.upper() == "IN 3":
-        return INPUT_IN3
-    elif input_name.upper() == "IN 4":
-        return INPUT_IN4
-    else:
+    index = DEFAULT_SCHEMA.index_of(INPUTS.name, input_name)
+    if index is None:
         raise ValueError('Invalid argument value for --input')
+    return index
 
 
 def get_mode_id(mode_name):
@@ -35,12 +25,10 @@ def get_mode_id(mode_name):
     Take a mode name and return the correct integer value to represent 
     it in the USB control transfer command
     """
-    if mode_name.upper() == "ON" :
-        return MODE_ON
-    elif mode_name.upper() == "OFF":
-        return MODE_OFF
-    else:
+    mode = DEFAULT_SCHEMA.value_of(INPUTS.name, mode_name)
+    if mode is None:
         raise ValueError('Invalid argument value for --mode')
+    return mode
 
 def set_input_mode(device, input, mode):
     """
@@ -49,7 +37,7 @@ def set_input_mode(device, input, mode):
     """
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 16)
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 50)
-    device.ctrl_transfer(0x40, 6, mode, input, None)
+    device.ctrl_transfer(0x40, INPUTS.write_command, mode, input, None)
 
 
 class InputCommand:
@@ -69,6 +57,12 @@ class InputCommand:
         self.input = get_input_index(args.input)
         self.mode = get_mode_id(args.mode)
     
+    def writes(self):
+        """
+        The (command, index, value) triples this command writes, for batch mode
+        """
+        return [(INPUTS.write_command, self.input, self.mode)]
+
     def execute(self, device):
         """
         Invokes the control transfer instruction to set input states
@@ -4,23 +4,20 @@ the US4x4 interface
 """
 import argparse
 
-INPUT_IN12 = 0x0000
-INPUT_IN34 = 0x0001
+from core.parameters import DEFAULT_SCHEMA
+
+MONITORING = DEFAULT_SCHEMA.group("MONITOR")
 
-MODE_MONO = 0x0000
-MODE_STEREO = 0x0001
 
 def get_input_index(input_name):
     """
     Take a named input pair, and return the correct index for the USB 
     control transfer instruction
     """
-    if input_name.upper() == "IN12":
-        return INPUT_IN12
-    elif input_name.upper() == "IN34":
-        return INPUT_IN34
-    else:
+    index = DEFAULT_SCHEMA.index_of(MONITORING.name, input_name)
+    if index is None:
         raise ValueError('Invalid argument value for --input')
+    return index
 
 
 def get_mode_id(mode_name):
@@ -28,12 +25,10 @@ def get_mode_id(mode_name):
     Take a mode name and return the correct integer value to represent 
     it in the USB control transfer command
     """
-    if mode_name.upper() == "MONO" :
-        return MODE_MONO
-    elif mode_name.upper() == "STEREO":
-        return MODE_STEREO
-    else:
+    mode = DEFAULT_SCHEMA.value_of(MONITORING.name, mode_name)
+    if mode is None:
         raise ValueError('Invalid argument value for --mode')
+    return mode
 
 def set_monitor_mode(device, input, mode):
     """
@@ -42,7 +37,7 @@ def set_monitor_mode(device, input, mode):
     """
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 16)
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 50)
-    device.ctrl_transfer(0x40, 8, mode, input, None)
+    device.ctrl_transfer(0x40, MONITORING.write_command, mode, input, None)
 
 
 class MonitorCommand:
@@ -63,6 +58,12 @@ class MonitorCommand:
         self.input = get_input_index(args.input)
         self.mode = get_mode_id(args.mode)
     
+    def writes(self):
+        """
+        The (command, index, value) triples this command writes, for batch mode
+        """
+        return [(MONITORING.write_command, self.input, self.mode)]
+
     def execute(self, device):
         """
         Invokes the control transfer instruction to set the monitoring mode
@@ -4,20 +4,20 @@ the US4x4 interface
 """
 import argparse
 
-MODE_OFF = 0x0000
-MODE_ON = 0x0001
+from core.parameters import DEFAULT_SCHEMA
+
+POWERSAVE = DEFAULT_SCHEMA.group("POWERSAVE")
+
 
 def get_mode_id(mode_name):
     """
     Take a mode name and return the correct integer value to represent 
     it in the USB control transfer command
     """
-    if mode_name.upper() == "ON" :
-        return MODE_ON
-    elif mode_name.upper() == "OFF":
-        return MODE_OFF
-    else:
+    mode = DEFAULT_SCHEMA.value_of(POWERSAVE.name, mode_name)
+    if mode is None:
         raise ValueError('Invalid argument value for --mode')
+    return mode
 
 def set_powersave_mode(device, mode):
     """
@@ -26,7 +26,7 @@ def set_powersave_mode(device, mode):
     """
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 16)
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 50)
-    device.ctrl_transfer(0x40, 4, mode, 0x0000, None)
+    device.ctrl_transfer(0x40, POWERSAVE.write_command, mode, 0x0000, None)
 
 
 class PowersaveCommand:
@@ -44,6 +44,12 @@ class PowersaveCommand:
         
         self.mode = get_mode_id(args.mode)
     
+    def writes(self):
+        """
+        The (command, index, value) triples this command writes, for batch mode
+        """
+        return [(POWERSAVE.write_command, 0x0000, self.mode)]
+
     def execute(self, device):
         """
         Invokes the control transfer instruction to set the powersave mode
@@ -3,87 +3,39 @@ This module contains a command to read parameters from the device
 """
 import argparse
 
+from core.parameters import DEFAULT_SCHEMA
 
-COMMAND_POWERSAVE = 0x03
-COMMAND_INPUT_ENABLE = 0x05
-COMMAND_MONITORING_MODE = 0x07
-COMMAND_ROUTING = 0x09
 
-INDICES_POWERSAVE = [0]
-INDICES_INPUT_ENABLE = [0, 1, 2, 3]
-INDICES_MONITORING_MODE = [0, 1]
-INDICES_ROUTING = [0, 1]
-
-CONVERT_POWERSAVE = ["Off", "On"]
-CONVERT_INPUT_ENABLE = ["Off", "On"]
-CONVERT_MONITORING_MODE = ["Mono", "Stereo"]
-CONVERT_ROUTING = ["Monitor Mix", "PC 1 & 2", "PC 3 & 4"]
-
-OUTPUT_POWERSAVE = "Auto-powersave {} is {}"
-OUTPUT_INPUT_ENABLE = "Input {} is {}"
-OUTPUT_MONITORING_MODE = "Channel Pair {} is monitored in {}"
-OUTPUT_ROUTING = "Channel Pair {} is playing back {}"
+def _get_group(command_name):
+    group = DEFAULT_SCHEMA.groups_by_name.get(command_name.upper())
+    if group is None:
+        raise ValueError('Invalid argument for --command')
+    return group
 
 def get_read_command(command_name):
     """
         Returns the value for bRequest
     """
-    if command_name.upper() == "POWERSAVE":
-        return COMMAND_POWERSAVE
-    elif command_name.upper() == "INPUT":
-        return COMMAND_INPUT_ENABLE
-    elif command_name.upper() == "MONITOR":
-        return COMMAND_MONITORING_MODE
-    elif command_name.upper() == "ROUTE":
-        return COMMAND_ROUTING
-    else:
-        raise ValueError('Invlaid argument for --command')
+    return _get_group(command_name).read_command
 
 def get_indices(command_name):
     """
         Returns the set of indices to iterate through
     """
-    if command_name.upper() == "POWERSAVE":
-        return INDICES_POWERSAVE
-    elif command_name.upper() == "INPUT":
-        return INDICES_INPUT_ENABLE
-    elif command_name.upper() == "MONITOR":
-        return INDICES_MONITORING_MODE
-    elif command_name.upper() == "ROUTE":
-        return INDICES_ROUTING
-    else:
-        raise ValueError('Invlaid argument for --command')
+    return list(range(len(_get_group(command_name).keys)))
 
 def get_output_conversion(command_name):
     """
         Returns a lookup to turn the response values back into
         strings
     """
-    if command_name.upper() == "POWERSAVE":
-        return CONVERT_POWERSAVE
-    elif command_name.upper() == "INPUT":
-        return CONVERT_INPUT_ENABLE
-    elif command_name.upper() == "MONITOR":
-        return CONVERT_MONITORING_MODE
-    elif command_name.upper() == "ROUTE":
-        return CONVERT_ROUTING
-    else:
-        raise ValueError('Invalid argument for --command')
+    return list(_get_group(command_name).labels)
 
 def get_message(command_name):
     """
         Returns the output string for the given command
     """
-    if command_name.upper() == "POWERSAVE":
-        return OUTPUT_POWERSAVE
-    elif command_name.upper() == "INPUT":
-        return OUTPUT_INPUT_ENABLE
-    elif command_name.upper() == "MONITOR":
-        return OUTPUT_MONITORING_MODE
-    elif command_name.upper() == "ROUTE":
-        return OUTPUT_ROUTING
-    else:
-        raise ValueError('Invalid argument for --command')
+    return _get_group(command_name).message
 
 def read_data(device, command, indices, output_conversion, message):
     """
@@ -109,11 +61,27 @@ class ReadCommand:
         parser.add_argument("-c", "--command", type=str, help="The line output device to route to, either POWERSAVE, INPUT, MONITOR, ROUTE")
         args = parser.parse_args(args)
         
+        self.group = _get_group(args.command)
         self.command = get_read_command(args.command)
         self.indices = get_indices(args.command)
         self.output_conversion = get_output_conversion(args.command)
         self.message = get_message(args.command)
     
+    def reads(self):
+        """
+        The (command, index) pairs this command reads, for batch mode
+        """
+        return [(self.command, index) for index in self.indices]
+
+    def results(self, values):
+        """
+        Maps the values read back for reads() to their names, for batch mode
+        """
+        return {
+            key: self.output_conversion[value] if value < len(self.output_conversion) else value
+            for key, value in zip(self.group.keys, values)
+        }
+
     def execute(self, device):
         """
         Executes the task of altering the internal signal routing of the device
@@ -3,12 +3,10 @@ This module contains a command to control the signal routing for the US4x4
 """
 import argparse
 
-MODE_MONITOR_MIX = 0x0000
-MODE_PC_OUT_12 = 0x0001
-MODE_PC_OUT_34 = 0x0002
+from core.parameters import DEFAULT_SCHEMA
+
+ROUTING = DEFAULT_SCHEMA.group("ROUTE")
 
-OUTPUT_LINE12 = 0x0000
-OUTPUT_LINE34 = 0x0001
 
 def get_output_index(output_name):
     """
@@ -18,12 +16,10 @@ def get_output_index(output_name):
     output_name - a string identifying which pair of LINE outputs we wish to
     modify
     """
-    if output_name == "LINE OUT 1/2":
-        return OUTPUT_LINE12
-    elif output_name == "LINE OUT 3/4":
-        return OUTPUT_LINE34
-    else:
+    index = DEFAULT_SCHEMA.index_of(ROUTING.name, output_name)
+    if index is None:
         raise ValueError('Invalid argument value for --device')
+    return index
 
 
 def get_mode_id(mode_name):
@@ -33,14 +29,10 @@ def get_mode_id(mode_name):
 
     mode_name - a string identifying which sound source we wish to route from
     """
-    if mode_name == "Input/Computer MIX":
-        return MODE_MONITOR_MIX
-    elif mode_name == "Computer OUT 1/2":
-        return MODE_PC_OUT_12
-    elif mode_name == "Computer OUT 3/4":
-        return MODE_PC_OUT_34
-    else:
+    mode = DEFAULT_SCHEMA.value_of(ROUTING.name, mode_name)
+    if mode is None:
         raise ValueError('Invalid argument value for --mode')
+    return mode
 
 def set_output_mode(device, output, mode):
     """
@@ -52,7 +44,7 @@ def set_output_mode(device, output, mode):
     """
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 16)
     device.ctrl_transfer(0xa1, 2, 0x0100, 0x2900, 50)
-    device.ctrl_transfer(0x40, 10, mode, output, None)
+    device.ctrl_transfer(0x40, ROUTING.write_command, mode, output, None)
 
 
 class RouteCommand:
@@ -72,6 +64,12 @@ class RouteCommand:
         self.source = get_mode_id(args.source)
         self.dest = get_output_index(args.dest)
     
+    def writes(self):
+        """
+        The (command, index, value) triples this command writes, for batch mode
+        """
+        return [(ROUTING.write_command, self.dest, self.source)]
+
     def execute(self, device):
         """
         Executes the task of altering the internal signal routing of the device
@@ -0,0 +1,50 @@
+"""
+This module contains a command to show USB transfer statistics
+"""
+import argparse
+import sys
+
+from core.handle_server import RemoteTransport, StatsDisabled
+from core.instrumentation import InstrumentedTransport, format_stats
+from core.read_state import read_state
+from core.transport import PyUsbTransport, TransportDevice
+
+
+class StatsCommand:
+    """
+    Shows per-request transfer counts, errors and latency percentiles.
+    With the daemon running (started with --stats) these are the daemon's
+    live numbers; otherwise the given number of full state reads is timed.
+    """
+    def __init__(self, args):
+        """
+        Constructor, parses the command-line arguments
+        """
+        parser = argparse.ArgumentParser()
+        parser.add_argument("-n", "--reads", type=int, default=10, help="Number of full state reads to time (direct mode)")
+        parser.add_argument("-r", "--reset", action="store_true", help="Reset the daemon's counters after printing")
+        args = parser.parse_args(args)
+
+        self.reads = args.reads
+        self.reset = args.reset
+
+    def execute(self, device):
+        """
+        Prints the statistics table
+        """
+        if isinstance(device, TransportDevice) and isinstance(device.transport, RemoteTransport):
+            try:
+                print(format_stats(device.transport.stats(reset=self.reset)))
+                return
+            except StatsDisabled:
+                print("The daemon keeps no statistics (start it with --stats); timing reads instead",
+                      file=sys.stderr)
+
+        if isinstance(device, TransportDevice):
+            transport = InstrumentedTransport(device.transport)
+        else:
+            transport = InstrumentedTransport(PyUsbTransport.from_device(device))
+
+        for _ in range(self.reads):
+            read_state(transport)
+        print(format_stats(transport.stats.snapshot()))
@@ -0,0 +1,46 @@
+""" Turn desired parameter values into a minimal, ordered batch of writes. """
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+from core.device_state import DeviceState
+from core.parameters import DEFAULT_SCHEMA, DeviceSchema, get_value
+
+
+@dataclass(frozen=True, slots=True)
+class Write:
+    key: str
+    command: int
+    index: int
+    value: int
+
+    def as_triple(self) -> tuple[int, int, int]:
+        return self.command, self.index, self.value
+
+
+def plan_writes(
+    desired: Mapping[str, int],
+    current: DeviceState | None = None,
+    schema: DeviceSchema = DEFAULT_SCHEMA,
+) -> list[Write]:
+    """
+    Build the writes needed to reach `desired` ({parameter key: raw value}).
+
+    Writes follow the schema's parameter order regardless of the mapping order. Keys that
+    already hold the desired value in `current` are dropped; with no current
+    state every desired key is written.
+    """
+    wanted = {schema.parameter(k).key: int(v) for k, v in desired.items()}
+
+    writes: list[Write] = []
+    for p in schema.parameters:
+        if p.key not in wanted:
+            continue
+        value = wanted[p.key]
+        if current is not None and get_value(current, p.key, schema) == value:
+            continue
+        writes.append(Write(p.key, p.write_command, p.index, value))
+
+    return writes
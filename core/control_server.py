@@ -0,0 +1,314 @@
+"""
+Local control API for a DeviceManager.
+
+A ControlServer speaks JSON-RPC 2.0 over a Unix socket, one JSON object
+per line in each direction. Clients can read and write parameters and
+subscribe to state changes. Subscribers get "state.changed"
+notifications with the parameters that changed, fanned out from the
+manager's own listeners. However many dashboards are attached, the USB
+traffic is the one poller's (start it with DeviceManager.start_polling).
+
+Methods:
+    parameters               {key: [value names]}
+    state      {refresh}     {"connected": bool, "values": {key: name} | null}
+    read       {keys}        {key: name}, read from the device now
+    write      {values, verify}
+                             {"written": n}; values map keys to names or raw ints
+    set        {values}      {"queued": n}; debounced write for live input (see
+                             core.write_queue); values that didn't get written
+                             come back in a "write.failed" notification
+    subscribe                like state; "state.changed" notifications follow
+    unsubscribe              true
+
+Values are the CLI's value names (see core.parameters.decode). Other
+notifications ("device.status") come from broadcast().
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any
+
+from core.device_manager import DeviceManager
+from core.device_state import DeviceState
+from core.handle_server import prepare_socket_path, remove_socket_path, socket_identity
+from core.parameters import decode, encode, state_values
+from core.transport import runtime_dir
+from core.write_queue import WriteQueue
+
+JSONRPC = "2.0"
+
+# Standard JSON-RPC error codes, plus one for the device side
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+DEVICE_ERROR = -32000
+
+
+def default_api_socket_path(vendor_id: int, product_id: int) -> Path:
+    return runtime_dir() / f"tascam-util-{vendor_id:04x}-{product_id:04x}-api.sock"
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+# --- Connections --------------------------------------------------------------
+
+class _Client:
+    """
+    One connection's outgoing side. Replies and notifications are queued
+    and written by the client's own thread, so a slow reader never holds
+    up the poller; one that falls `max_queued` messages behind is dropped.
+    """
+
+    def __init__(self, sock: socket.socket, wfile, max_queued: int) -> None:
+        self._sock = sock
+        self._wfile = wfile
+        self._outbox: queue.Queue[bytes | None] = queue.Queue(max_queued)
+        self.subscribed = False
+        self._thread = threading.Thread(target=self._run, name="control-client", daemon=True)
+        self._thread.start()
+
+    def send(self, msg: dict) -> None:
+        try:
+            self._outbox.put_nowait(json.dumps(msg).encode("utf-8") + b"\n")
+        except queue.Full:
+            self.drop()
+
+    def drop(self) -> None:
+        # Ends the read loop in handle() as well as any pending write
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        try:
+            self._outbox.put_nowait(None)
+        except queue.Full:
+            self.drop()
+        self._thread.join(1.0)
+
+    def _run(self) -> None:
+        while True:
+            data = self._outbox.get()
+            if data is None:
+                return
+            try:
+                self._wfile.write(data)
+                self._wfile.flush()
+            except OSError:
+                return
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: ControlServer
+
+    def handle(self) -> None:
+        client = _Client(self.connection, self.wfile, self.server.max_queued)
+        self.server._add_client(client)
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                reply = self.server.dispatch(client, line)
+                if reply is not None:
+                    client.send(reply)
+        except OSError:
+            pass
+        finally:
+            self.server._remove_client(client)
+            client.close()
+
+
+# --- Server -------------------------------------------------------------------
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves one DeviceManager to local clients. The manager is not owned:
+    connecting, polling and disconnecting stay with the caller.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        manager: DeviceManager,
+        socket_path: Path,
+        max_queued: int = 256,
+        debounce: float = 0.05,
+    ) -> None:
+        self.manager = manager
+        self.socket_path = Path(socket_path)
+        self.max_queued = max_queued
+        self._clients: list[_Client] = []
+        self._clients_lock = threading.Lock()
+
+        prepare_socket_path(self.socket_path)
+        super().__init__(str(self.socket_path), _Handler)
+        os.chmod(self.socket_path, 0o600)
+        self._socket_identity = socket_identity(self.socket_path)
+
+        self._unsubscribe = manager.subscribe(self._on_state_changed)
+        self.writes = WriteQueue(manager, debounce=debounce, listener=self._on_flushed)
+
+    # --- Fan-out -----------------------------------------------------------------
+
+    def _add_client(self, client: _Client) -> None:
+        with self._clients_lock:
+            self._clients.append(client)
+
+    def _remove_client(self, client: _Client) -> None:
+        with self._clients_lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def broadcast(self, method: str, params: dict) -> None:
+        """Send a notification to every subscriber; never blocks."""
+        msg = {"jsonrpc": JSONRPC, "method": method, "params": params}
+        with self._clients_lock:
+            subscribers = [c for c in self._clients if c.subscribed]
+        for client in subscribers:
+            client.send(msg)
+
+    def _on_state_changed(self, changes: dict[str, int], state: DeviceState) -> None:
+        # Runs on the poller thread (or a writer's, for write-through updates)
+        self.broadcast("state.changed", {"changes": self._names(changes)})
+
+    def _on_flushed(self, values: dict[str, int], dropped: dict[str, int], error: str | None) -> None:
+        if dropped:
+            self.broadcast("write.failed", {
+                "values": self._names(dropped),
+                "error": error or self.manager.last_error or "Write failed",
+            })
+
+    # --- Requests ----------------------------------------------------------------
+
+    def dispatch(self, client: _Client, line: bytes) -> dict | None:
+        """Handle one request line; returns the reply, or None for a notification."""
+        try:
+            msg = json.loads(line)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {e}")
+        if not isinstance(msg, dict) or not isinstance(msg.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+
+        msg_id = msg.get("id")
+        params = msg.get("params") or {}
+        try:
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            handler = self._METHODS.get(msg["method"])
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {msg['method']}")
+            result = handler(self, client, **params)
+        except RpcError as e:
+            reply = _error(msg_id, e.code, e.message)
+        except (TypeError, ValueError) as e:
+            reply = _error(msg_id, INVALID_PARAMS, str(e))
+        else:
+            reply = {"jsonrpc": JSONRPC, "id": msg_id, "result": result}
+
+        return reply if "id" in msg else None
+
+    def _names(self, values: dict[str, int]) -> dict[str, str]:
+        schema = self.manager.schema
+        return {key: decode(key, value, schema) for key, value in values.items()}
+
+    def _state_result(self, state: DeviceState | None) -> dict[str, Any]:
+        values = None if state is None else self._names(state_values(state, self.manager.schema))
+        return {"connected": self.manager.connected, "values": values}
+
+    def _device_error(self, fallback: str) -> RpcError:
+        return RpcError(DEVICE_ERROR, self.manager.last_error or fallback)
+
+    def _rpc_parameters(self, client: _Client) -> dict[str, list[str]]:
+        return {p.key: list(p.choices) for p in self.manager.schema.parameters}
+
+    def _rpc_state(self, client: _Client, refresh: bool = False) -> dict[str, Any]:
+        if refresh:
+            if self.manager.read_state() is None:
+                raise self._device_error("Device is not connected")
+        return self._state_result(self.manager.state)
+
+    def _rpc_read(self, client: _Client, keys: list[str]) -> dict[str, str]:
+        if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+            raise RpcError(INVALID_PARAMS, "keys must be a list of parameter keys")
+        schema = self.manager.schema
+        values: dict[str, int] = {}
+        for key in keys:
+            key = schema.parameter(key).key
+            value = self.manager.read_param(key)
+            if value is None:
+                raise self._device_error("Device is not connected")
+            values[key] = value
+        return self._names(values)
+
+    def _encode_values(self, values: dict[str, Any]) -> dict[str, int]:
+        """{key: value name or raw value} -> {key: raw value}, rejecting anything the parameter can't hold."""
+        if not isinstance(values, dict):
+            raise RpcError(INVALID_PARAMS, "values must be an object")
+        schema = self.manager.schema
+        desired: dict[str, int] = {}
+        for key, value in values.items():
+            p = schema.parameter(key)
+            if isinstance(value, str):
+                value = encode(p.key, value, schema)
+            elif isinstance(value, bool) or not isinstance(value, int):
+                raise RpcError(INVALID_PARAMS, f"Invalid value for {p.key}: {value!r}")
+            elif not 0 <= value < len(p.choices):
+                raise RpcError(INVALID_PARAMS, f"Value out of range for {p.key}: {value}")
+            desired[p.key] = value
+        return desired
+
+    def _rpc_write(self, client: _Client, values: dict[str, Any], verify: bool = True) -> dict[str, int]:
+        written = self.manager.apply(self._encode_values(values), verify=verify)
+        if written is None:
+            raise self._device_error("Write failed")
+        return {"written": written}
+
+    def _rpc_set(self, client: _Client, values: dict[str, Any]) -> dict[str, int]:
+        desired = self._encode_values(values)
+        for key, value in desired.items():
+            self.writes.submit(key, value)
+        return {"queued": len(desired)}
+
+    def _rpc_subscribe(self, client: _Client) -> dict[str, Any]:
+        client.subscribed = True
+        return self._state_result(self.manager.state)
+
+    def _rpc_unsubscribe(self, client: _Client) -> bool:
+        client.subscribed = False
+        return True
+
+    _METHODS = {
+        "parameters": _rpc_parameters,
+        "state": _rpc_state,
+        "read": _rpc_read,
+        "write": _rpc_write,
+        "set": _rpc_set,
+        "subscribe": _rpc_subscribe,
+        "unsubscribe": _rpc_unsubscribe,
+    }
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Queued values still go out; the caller disconnects afterwards
+        self.writes.close()
+        self._unsubscribe()
+        remove_socket_path(self.socket_path, self._socket_identity)
+
+
+def _error(msg_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": JSONRPC, "id": msg_id, "error": {"code": code, "message": message}}
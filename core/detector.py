@@ -1,17 +1,78 @@
-# core/detector.py
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 from core.devices import DeviceDescriptor, SUPPORTED_DEVICES
-from core.transport import PyUsbTransport
+from core.transport import PyUsbTransport, UsbDeviceInfo
+
+
+@dataclass(frozen=True, slots=True)
+class DetectedDevice:
+    """One physical unit of a supported model."""
+    descriptor: DeviceDescriptor
+    path: str
+    serial: str | None = None
+
+    @property
+    def key(self) -> str:
+        """Identity of the unit: serial number where the device has one, else bus/port path."""
+        return f"sn:{self.serial}" if self.serial else f"usb:{self.path}"
+
+
+def index_descriptors(
+    supported: tuple[DeviceDescriptor, ...] = SUPPORTED_DEVICES,
+) -> dict[tuple[int, int], list[DeviceDescriptor]]:
+    """(vendor_id, product_id) -> descriptors using that id (placeholders may share one)."""
+    index: dict[tuple[int, int], list[DeviceDescriptor]] = {}
+    for d in supported:
+        index.setdefault((d.vendor_id, d.product_id), []).append(d)
+    return index
 
 
 def detect_supported_devices(
     supported: tuple[DeviceDescriptor, ...] = SUPPORTED_DEVICES,
 ) -> list[DeviceDescriptor]:
+    """Enumerate the bus once and match every supported descriptor against it."""
+    index = index_descriptors(supported)
+    present = set(PyUsbTransport.list_present())
+
     found: list[DeviceDescriptor] = []
+    for key, descriptors in index.items():
+        if key in present:
+            found.extend(descriptors)
 
-    for d in supported:
-        if PyUsbTransport.is_present(d.vendor_id, d.product_id):
-            found.append(d)
+    # Keep registry order
+    found.sort(key=supported.index)
+    return found
+
+
+def detect_devices(
+    supported: tuple[DeviceDescriptor, ...] = SUPPORTED_DEVICES,
+) -> list[DetectedDevice]:
+    """Like detect_supported_devices, but one entry per physical unit."""
+    index = index_descriptors(supported)
+    vendors = {vid for vid, _ in index}
 
+    # All registry entries share TEAC's vendor id; filter during enumeration then
+    infos: list[UsbDeviceInfo] = PyUsbTransport.list_devices(
+        next(iter(vendors)) if len(vendors) == 1 else None
+    )
+
+    found: list[DetectedDevice] = []
+    for info in infos:
+        for d in index.get((info.vendor_id, info.product_id), ()):
+            found.append(DetectedDevice(d, info.path, info.serial))
+
+    found.sort(key=lambda dd: (supported.index(dd.descriptor), dd.path))
     return found
+
+
+def detect_at_path(descriptor: DeviceDescriptor, path: str) -> DetectedDevice | None:
+    """
+    Look for one model on a known bus/port path (e.g. where it was last
+    seen) without enumerating serial numbers of everything else.
+    """
+    info = PyUsbTransport.device_at(descriptor.vendor_id, descriptor.product_id, path)
+    if info is None:
+        return None
+    return DetectedDevice(descriptor, info.path, info.serial)
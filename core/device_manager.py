@@ -1,19 +1,34 @@
-# core/device_manager.py
 from __future__ import annotations
 
+import threading
 from enum import Enum, auto
+from typing import Callable, Mapping
 
+from core.apply import plan_writes
 from core.devices import DeviceDescriptor
+from core.instrumentation import InstrumentedTransport, TransferStats
 from core.device_state import DeviceState
+from core.parameters import DeviceSchema, diff_states, set_value, state_values
+from core.poller import StatePoller
+from core.profiles import Profile, recall_changes
+from core.reconnect import ReconnectListener, ReconnectSupervisor
 from core.read_state import read_state as _read_state
+from core import protocol
 from core.transport import (
+    CtrlRequest,
     PyUsbTransport,
+    Transport,
     DeviceNotFound,
+    Disconnected,
     PermissionDenied,
     TransportError,
 )
 
 
+# listener(changes, state): changes maps parameter key -> new raw value
+StateListener = Callable[[dict[str, int], DeviceState], None]
+
+
 class DeviceStatus(Enum):
     DISCONNECTED = auto()
     CONNECTED = auto()
@@ -21,36 +36,120 @@ class DeviceStatus(Enum):
 
 
 class DeviceManager:
-    def __init__(self, descriptor: DeviceDescriptor) -> None:
+    def __init__(
+        self,
+        descriptor: DeviceDescriptor,
+        *,
+        path: str | None = None,
+        key: str | None = None,
+        stats: TransferStats | None = None,
+        transport_factory: Callable[[], Transport] | None = None,
+        max_failures: int = 3,
+    ) -> None:
         self._descriptor = descriptor
-        self._transport: PyUsbTransport | None = None
+        self._path = path
+        self._key = key
+        # Opt-in: when given, every transfer is timed into it
+        self.stats = stats
+        # Builds the (unopened) transport; defaults to PyUSB for the descriptor
+        self._transport_factory = transport_factory or self._default_transport
+        self._transport: Transport | None = None
         self.last_error: str | None = None
         self.status: DeviceStatus = DeviceStatus.DISCONNECTED
 
+        # Circuit breaker: a disconnect opens it at once, other transfer errors
+        # after max_failures in a row. Open means no transport and no transfers
+        # until connect() succeeds again.
+        self.max_failures = max_failures
+        self._failures = 0
+
+        # Serializes transport access between callers and the poller thread
+        self._io_lock = threading.RLock()
+        # Write-through cache of the device state, and the state listeners last saw
+        self._state: DeviceState | None = None
+        self._published: DeviceState | None = None
+        # Values an apply() in progress is writing, and what to put back after
+        # the connection drops ({key: raw value}; see recover())
+        self._pending: dict[str, int] = {}
+        self._restore_target: dict[str, int] = {}
+
+        self._listeners: list[StateListener] = []
+        self._poller: StatePoller | None = None
+        self._supervisor: ReconnectSupervisor | None = None
+
     @property
     def descriptor(self) -> DeviceDescriptor:
         return self._descriptor
 
+    @property
+    def schema(self) -> DeviceSchema:
+        return self._descriptor.schema
+
+    @property
+    def path(self) -> str | None:
+        """Bus/port path the manager opens (see usb_path); None means the first match."""
+        return self._path
+
+    @property
+    def key(self) -> str:
+        """Identity of the managed unit (see DetectedDevice.key); VID:PID when unknown."""
+        if self._key is not None:
+            return self._key
+        return f"{self._descriptor.vendor_id:04x}:{self._descriptor.product_id:04x}"
+
     @property
     def connected(self) -> bool:
         return self.status == DeviceStatus.CONNECTED
 
+    @property
+    def state(self) -> DeviceState | None:
+        """
+        Cached device state: the last read, updated by every successful write.
+        None until the first read. Costs no USB traffic.
+        """
+        return self._state
+
+    def enable_stats(self, stats: TransferStats) -> None:
+        """Start timing every transfer into `stats`, from now on and across reconnects."""
+        with self._io_lock:
+            self.stats = stats
+            if self._transport is not None and not isinstance(self._transport, InstrumentedTransport):
+                self._transport = InstrumentedTransport(self._transport, stats)
+
     def disconnect(self) -> None:
-        if self._transport is not None:
-            try:
-                self._transport.close()
-            except Exception:
-                pass
-        self._transport = None
-        self.status = DeviceStatus.DISCONNECTED
-        self.last_error = None
+        self.stop_auto_reconnect()
+        self.stop_polling()
+        with self._io_lock:
+            if self._transport is not None:
+                try:
+                    self._transport.close()
+                except Exception:
+                    pass
+            self._transport = None
+            self._state = None
+            self._published = None
+            self._restore_target = {}
+            self.status = DeviceStatus.DISCONNECTED
+            self.last_error = None
 
-    def connect(self) -> bool:
-        self._transport = PyUsbTransport(
+    def _default_transport(self) -> Transport:
+        return PyUsbTransport(
             self._descriptor.vendor_id,
             self._descriptor.product_id,
+            self._descriptor.control_interfaces,
+            self._path,
         )
 
+    def connect(self) -> bool:
+        with self._io_lock:
+            return self._connect()
+
+    def _connect(self) -> bool:
+        self._failures = 0
+        self._transport = self._transport_factory()
+        if self.stats is not None:
+            self._transport = InstrumentedTransport(self._transport, self.stats)
+
         try:
             self._transport.open()
             self.last_error = None
@@ -76,14 +175,290 @@ class DeviceManager:
             return False
 
     def read_state(self) -> DeviceState | None:
-        if self.status != DeviceStatus.CONNECTED or self._transport is None:
-            return None
+        with self._io_lock:
+            if self.status != DeviceStatus.CONNECTED or self._transport is None:
+                return None
 
-        try:
-            return _read_state(self._transport)
+            try:
+                self._state = _read_state(self._transport, self.schema)
+                self._failures = 0
+                return self._state
 
-        except TransportError:
-            self._transport = None
-            self.status = DeviceStatus.ERROR
-            self.last_error = "Communication failed during read"
-            return None
+            except TransportError as e:
+                self._transfer_failed(e, "read")
+                return None
+
+    def read_param(self, key: str) -> int | None:
+        """Read a single parameter (e.g. "POWERSAVE", "IN3") without a full snapshot."""
+        p = self.schema.parameter(key)
+
+        with self._io_lock:
+            if self.status != DeviceStatus.CONNECTED or self._transport is None:
+                return None
+
+            try:
+                value = protocol.read_byte(self._transport, p.read_command, p.index)
+                self._failures = 0
+                return value
+
+            except TransportError as e:
+                self._transfer_failed(e, "read")
+                return None
+
+    def refresh(self) -> dict[str, int]:
+        """Read the full state and notify subscribers of what changed since last time."""
+        with self._io_lock:
+            state = self.read_state()
+            if state is None:
+                return {}
+            return self._publish(state)
+
+    def apply(self, desired: Mapping[str, int], *, verify: bool = True) -> int | None:
+        """
+        Write {parameter key: raw value} to the device as one batch.
+
+        Values already matching the cached state are skipped (the state is
+        read first if nothing is cached). With `verify`, only the written
+        parameters are read back. The cache is updated either way and
+        subscribers are notified. Returns the number of writes issued, or
+        None on failure.
+        """
+        with self._io_lock:
+            if self.status != DeviceStatus.CONNECTED or self._transport is None:
+                return None
+
+            if self._state is None and self.read_state() is None:
+                return None
+
+            writes = plan_writes(desired, self._state, self.schema)
+            if not writes:
+                return 0
+
+            self._pending = {w.key: w.value for w in writes}
+            try:
+                protocol.write_bytes(self._transport, [w.as_triple() for w in writes])
+
+                if verify:
+                    params = [(self.schema.parameter(w.key).read_command, w.index) for w in writes]
+                    actual = protocol.read_bytes(self._transport, params)
+                else:
+                    actual = [w.value for w in writes]
+
+            except TransportError as e:
+                self._transfer_failed(e, "write")
+                return None
+
+            finally:
+                self._pending = {}
+
+            self._failures = 0
+            state = self._state.copy()
+            for w, value in zip(writes, actual):
+                set_value(state, w.key, value, self.schema)
+            self._state = state
+            self._publish(state)
+
+            rejected = [w.key for w, value in zip(writes, actual) if value != w.value]
+            if rejected:
+                self.last_error = f"Device did not accept: {', '.join(rejected)}"
+                return None
+
+            return len(writes)
+
+    def write_param(self, key: str, value: int, *, verify: bool = True) -> bool:
+        return self.apply({key: value}, verify=verify) is not None
+
+    def recall(self, profile: Profile, *, verify: bool = True) -> int | None:
+        """
+        Bring the device to a stored profile, writing only the parameters
+        that differ from the current state. Same result as apply().
+        """
+        with self._io_lock:
+            if self._state is None and self.read_state() is None:
+                return None
+            return self.apply(recall_changes(profile, self._state, self.schema), verify=verify)
+
+    def _transfer_failed(self, error: TransportError, during: str) -> None:
+        """Record a failed transfer and open the circuit breaker if warranted (caller holds _io_lock)."""
+        if isinstance(error, Disconnected):
+            self._trip(DeviceStatus.DISCONNECTED, "Device disconnected")
+            return
+
+        self._failures += 1
+        if self._failures >= self.max_failures:
+            self._trip(DeviceStatus.ERROR, f"Communication failed during {during}")
+        else:
+            self.last_error = f"Communication failed during {during}"
+
+    def _trip(self, status: DeviceStatus, error: str) -> None:
+        # Remember what the device should look like once it is back
+        if self._state is not None:
+            self._restore_target.update(state_values(self._state, self.schema))
+        self._restore_target.update(self._pending)
+
+        # Release the handle now; on a gone device this fails fast and is ignored
+        if self._transport is not None:
+            try:
+                self._transport.close()
+            except Exception:
+                pass
+        self._transport = None
+        self._state = None
+        self.status = status
+        self.last_error = error
+
+        if self._supervisor is not None:
+            self._supervisor.notify_lost()
+
+    def recover(self) -> bool:
+        """
+        Reconnect after the circuit breaker opened and re-apply whatever
+        differs from the last known (or last requested) state. Returns True
+        once connected; a restore the device rejects still counts as connected.
+        """
+        with self._io_lock:
+            if self.connected:
+                return True
+            if not self._connect():
+                return False
+
+            target = self._restore_target
+            if target and self.apply(target) is None and not self.connected:
+                return False
+            self._restore_target = {}
+            return True
+
+    # -------------------------
+    # Sharing the handle
+    # -------------------------
+
+    def shared_transport(self) -> Transport:
+        """
+        A Transport over this manager's open handle, for serving other
+        processes (see core.handle_server) while this one holds the device.
+        Transfers take turns with the manager's own under _io_lock and count
+        towards its circuit breaker; open/close leave the handle alone.
+        Changes made through it reach the state cache on the next full poll.
+        """
+        return _SharedTransport(self)
+
+    # -------------------------
+    # Auto reconnect
+    # -------------------------
+
+    @property
+    def auto_reconnect(self) -> bool:
+        return self._supervisor is not None and self._supervisor.running
+
+    def start_auto_reconnect(
+        self,
+        *,
+        initial_delay: float = 0.02,
+        max_delay: float = 5.0,
+        max_attempts: int | None = None,
+        listener: ReconnectListener | None = None,
+    ) -> None:
+        """Reconnect and restore state on a supervisor thread whenever the connection drops."""
+        self.stop_auto_reconnect()
+        self._supervisor = ReconnectSupervisor(
+            self,
+            initial_delay=initial_delay,
+            max_delay=max_delay,
+            max_attempts=max_attempts,
+            listener=listener,
+        )
+        self._supervisor.start()
+
+    def stop_auto_reconnect(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.stop()
+            self._supervisor = None
+
+    # -------------------------
+    # Polling
+    # -------------------------
+
+    def subscribe(self, listener: StateListener) -> Callable[[], None]:
+        """
+        Register listener(changes, state) for polled state changes.
+        Listeners run on the poller thread. Returns an unsubscribe callable.
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _publish(self, state: DeviceState) -> dict[str, int]:
+        changes = diff_states(self._published, state, self.schema)
+        self._published = state
+        if changes:
+            for listener in list(self._listeners):
+                listener(changes, state)
+        return changes
+
+    @property
+    def polling(self) -> bool:
+        return self._poller is not None and self._poller.running
+
+    def start_polling(
+        self,
+        *,
+        interval: float = 0.25,
+        max_interval: float = 2.0,
+        full_interval: float = 2.0,
+        sentinel: str = "POWERSAVE",
+    ) -> None:
+        self.stop_polling()
+        self._poller = StatePoller(
+            self,
+            interval=interval,
+            max_interval=max_interval,
+            full_interval=full_interval,
+            sentinel=sentinel,
+        )
+        self._poller.start()
+
+    def stop_polling(self) -> None:
+        if self._poller is not None:
+            self._poller.stop()
+            self._poller = None
+
+
+class _SharedTransport:
+    def __init__(self, manager: DeviceManager) -> None:
+        self._manager = manager
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def is_open(self) -> bool:
+        return self._manager.connected
+
+    def _run(self, during: str, call: Callable[[Transport], object]):
+        m = self._manager
+        with m._io_lock:
+            if m.status != DeviceStatus.CONNECTED or m._transport is None:
+                raise Disconnected(m.last_error or "Device is not connected")
+            try:
+                result = call(m._transport)
+            except TransportError as e:
+                m._transfer_failed(e, during)
+                raise
+            m._failures = 0
+            return result
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        return self._run("read", lambda t: t.ctrl_transfer_in(req))
+
+    def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                          w_value: int, w_index: int, data: bytes,
+                          timeout_ms: int = 1000) -> int:
+        return self._run("write", lambda t: t.ctrl_transfer_out(
+            bm_request_type, b_request, w_value, w_index, data, timeout_ms,
+        ))
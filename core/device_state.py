@@ -2,6 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from typing import Any
+
+# Bumped when the serialized layout (to_dict) changes
+STATE_VERSION = 1
 
 
 @dataclass(slots=True)
@@ -19,3 +23,39 @@ class DeviceState:
     # 2 routing groups: Line 1/2 and Line 3/4
     # values are device-defined (for now int; Enum later)
     routing: list[int] = field(default_factory=lambda: [0, 0])
+
+    def copy(self) -> DeviceState:
+        return DeviceState(
+            powersave=self.powersave,
+            input_enable=list(self.input_enable),
+            monitoring_mode=list(self.monitoring_mode),
+            routing=list(self.routing),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "powersave": self.powersave,
+            "input_enable": list(self.input_enable),
+            "monitoring_mode": list(self.monitoring_mode),
+            "routing": list(self.routing),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceState:
+        """Inverse of to_dict; raises ValueError on anything it can't trust."""
+        version = data.get("version")
+        if version != STATE_VERSION:
+            raise ValueError(f"Unsupported device state version: {version!r}")
+
+        default = cls()
+        state = cls(
+            powersave=bool(data.get("powersave", default.powersave)),
+            input_enable=[bool(v) for v in data.get("input_enable", default.input_enable)],
+            monitoring_mode=[int(v) for v in data.get("monitoring_mode", default.monitoring_mode)],
+            routing=[int(v) for v in data.get("routing", default.routing)],
+        )
+        for name in ("input_enable", "monitoring_mode", "routing"):
+            if len(getattr(state, name)) != len(getattr(default, name)):
+                raise ValueError(f"Wrong number of values for {name}")
+        return state
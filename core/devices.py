@@ -3,20 +3,34 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from core.parameters import DeviceSchema, US4X4_SCHEMA
+
 
 @dataclass(frozen=True, slots=True)
 class DeviceDescriptor:
     name: str
     vendor_id: int
     product_id: int
+    # Interfaces to detach/claim for vendor control transfers.
+    # () means the device accepts them with nothing claimed.
+    control_interfaces: tuple[int, ...] = (0, 1, 2, 3, 4)
+    # Parameters the model exposes (placeholders reuse the US-4x4 schema for now)
+    schema: DeviceSchema = US4X4_SCHEMA
 
 
 """ Supported device descriptors (registry). """
 
+# The prep request targets the AudioControl interface (wIndex 0x2900 -> iface 0);
+# reads/writes are device-level vendor requests. Interface-recipient requests
+# need the interface claimed (usbfs), so 0 is detached for the duration.
+# snd-usb-audio binds the whole card through it: detaching 0 still tears
+# down the card and any running ALSA stream, and it is re-probed on release.
+# Only MIDI (3) and HID (4) are left undisturbed.
 US4X4 = DeviceDescriptor(
     name = "Tascam US-4X4",
     vendor_id = 0x0644,
-    product_id = 0x804E
+    product_id = 0x804E,
+    control_interfaces = (0,),
 )
 
 # Placeholder until find the real PID for US-4x4HR
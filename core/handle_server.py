@@ -0,0 +1,262 @@
+"""
+Long-lived device handle owner.
+
+A HandleServer keeps one Transport open (interfaces claimed) and serves
+control transfers over a Unix socket, one JSON object per line.
+RemoteTransport is the matching client; it implements Transport, so
+anything that runs over a transport can use the daemon unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Callable
+
+from core.instrumentation import InstrumentedTransport, TransferStats
+from core.transport import (
+    CtrlRequest,
+    Disconnected,
+    Transport,
+    TransportError,
+    error_from_name,
+    runtime_dir,
+)
+
+
+class DaemonUnavailable(TransportError):
+    """No handle server is listening on the socket."""
+
+
+class StatsDisabled(TransportError):
+    """The handle server was started without transfer statistics."""
+
+
+class SocketInUse(OSError):
+    """Another server is already listening on the socket."""
+
+
+def default_socket_path(vendor_id: int, product_id: int) -> Path:
+    return runtime_dir() / f"tascam-util-{vendor_id:04x}-{product_id:04x}.sock"
+
+
+def prepare_socket_path(socket_path: Path) -> None:
+    """
+    Make way for a new server on socket_path: a socket left behind by a
+    dead server is removed, a live one raises SocketInUse.
+    """
+    if not socket_path.exists():
+        return
+    remote = connect_remote(socket_path)
+    if remote is not None:
+        remote.close()
+        raise SocketInUse(f"Another server is already listening on {socket_path}")
+    socket_path.unlink(missing_ok=True)
+
+
+def socket_identity(socket_path: Path) -> tuple[int, int]:
+    st = socket_path.stat()
+    return st.st_dev, st.st_ino
+
+
+def remove_socket_path(socket_path: Path, identity: tuple[int, int]) -> None:
+    """Remove socket_path if it is still the socket identified by `identity`."""
+    try:
+        if socket_identity(socket_path) == identity:
+            socket_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# --- Server -------------------------------------------------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: HandleServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                reply = self.server.dispatch(json.loads(line))
+            except (ValueError, KeyError, TypeError) as e:
+                reply = {"ok": False, "error": "TransportError", "message": f"Bad request: {e}"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class HandleServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves transfers for one device. Transfers from all clients are
+    serialized; the transport is reopened lazily after a disconnect.
+    With `stats` given, every transfer is timed into it (op "stats"
+    returns a snapshot).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        transport_factory: Callable[[], Transport],
+        socket_path: Path,
+        stats: TransferStats | None = None,
+    ) -> None:
+        self._factory = transport_factory
+        self._transport: Transport | None = None
+        self._lock = threading.Lock()
+        self.socket_path = Path(socket_path)
+        self.stats = stats
+
+        prepare_socket_path(self.socket_path)
+        super().__init__(str(self.socket_path), _Handler)
+        os.chmod(self.socket_path, 0o600)
+        self._socket_identity = socket_identity(self.socket_path)
+
+    def _require_transport(self) -> Transport:
+        if self._transport is None or not self._transport.is_open():
+            transport = self._factory()
+            if self.stats is not None:
+                transport = InstrumentedTransport(transport, self.stats)
+            transport.open()
+            self._transport = transport
+        return self._transport
+
+    def dispatch(self, msg: dict) -> dict:
+        op = msg["op"]
+        if op == "ping":
+            return {"ok": True}
+        if op == "stats":
+            if self.stats is None:
+                return {"ok": False, "error": "StatsDisabled", "message": "Transfer statistics are off"}
+            snapshot = self.stats.snapshot()
+            if msg.get("reset"):
+                self.stats.reset()
+            return {"ok": True, "stats": snapshot}
+
+        with self._lock:
+            try:
+                transport = self._require_transport()
+
+                if op == "in":
+                    data = transport.ctrl_transfer_in(CtrlRequest(
+                        msg["bm"], msg["b"], msg["v"], msg["i"], msg["length"], msg.get("timeout_ms", 1000),
+                    ))
+                    return {"ok": True, "data": data.hex()}
+
+                if op == "out":
+                    written = transport.ctrl_transfer_out(
+                        msg["bm"], msg["b"], msg["v"], msg["i"],
+                        bytes.fromhex(msg.get("data", "")), msg.get("timeout_ms", 1000),
+                    )
+                    return {"ok": True, "written": written}
+
+                raise ValueError(f"unknown op {op!r}")
+
+            except TransportError as e:
+                # A stall or timeout leaves the device (and its claim) in place;
+                # re-claiming interface 0 would reset the sound card
+                if isinstance(e, Disconnected):
+                    self._drop_transport()
+                return {"ok": False, "error": type(e).__name__, "message": str(e)}
+
+    def _drop_transport(self) -> None:
+        if self._transport is not None:
+            try:
+                self._transport.close()
+            except Exception:
+                pass
+        self._transport = None
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self._lock:
+            self._drop_transport()
+        # Leaves alone a socket another server has bound there since
+        remove_socket_path(self.socket_path, self._socket_identity)
+
+
+# --- Client -------------------------------------------------------------------
+
+class RemoteTransport:
+    """Transport that forwards every transfer to a HandleServer."""
+
+    def __init__(self, socket_path: Path, connect_timeout: float = 0.5) -> None:
+        self._path = Path(socket_path)
+        self._connect_timeout = connect_timeout
+        self._sock: socket.socket | None = None
+        self._rfile = None
+
+    def open(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._connect_timeout)
+        try:
+            sock.connect(str(self._path))
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailable(f"No handle server at {self._path}: {e}") from e
+        sock.settimeout(None)
+        self._sock = sock
+        self._rfile = sock.makefile("rb")
+
+    def close(self) -> None:
+        if self._rfile is not None:
+            self._rfile.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+        self._rfile = None
+
+    def is_open(self) -> bool:
+        return self._sock is not None
+
+    def _call(self, msg: dict) -> dict:
+        if self._sock is None or self._rfile is None:
+            raise Disconnected("RemoteTransport is not open")
+        try:
+            self._sock.sendall(json.dumps(msg).encode("utf-8") + b"\n")
+            line = self._rfile.readline()
+        except OSError as e:
+            raise Disconnected(str(e)) from e
+        if not line:
+            raise Disconnected("Handle server closed the connection")
+
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            if reply.get("error") == "StatsDisabled":
+                raise StatsDisabled(reply.get("message", ""))
+            raise error_from_name(reply.get("error"), reply.get("message", ""))
+        return reply
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        reply = self._call({
+            "op": "in", "bm": req.bm_request_type, "b": req.b_request,
+            "v": req.w_value, "i": req.w_index, "length": req.length, "timeout_ms": req.timeout_ms,
+        })
+        return bytes.fromhex(reply["data"])
+
+    def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                          w_value: int, w_index: int, data: bytes,
+                          timeout_ms: int = 1000) -> int:
+        reply = self._call({
+            "op": "out", "bm": bm_request_type, "b": b_request,
+            "v": w_value, "i": w_index, "data": bytes(data).hex(), "timeout_ms": timeout_ms,
+        })
+        return int(reply["written"])
+
+    def stats(self, reset: bool = False) -> dict[str, dict]:
+        """The server's TransferStats snapshot; StatsDisabled when it keeps none."""
+        return self._call({"op": "stats", "reset": reset})["stats"]
+
+
+def connect_remote(socket_path: Path) -> RemoteTransport | None:
+    """Open a RemoteTransport, or return None when no daemon is running."""
+    remote = RemoteTransport(socket_path)
+    try:
+        remote.open()
+    except DaemonUnavailable:
+        return None
+    return remote
@@ -0,0 +1,163 @@
+"""
+Hotplug notifications for supported devices.
+
+Sources deliver raw USB add/remove events; HotplugWatcher matches them
+against the descriptor registry. UeventSource listens to kernel uevents
+on a netlink socket (Linux, stdlib only); FakeHotplugSource is driven by
+hand for tests and development.
+"""
+
+from __future__ import annotations
+
+import select
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Callable, Protocol
+
+from core.detector import index_descriptors
+from core.devices import DeviceDescriptor, SUPPORTED_DEVICES
+
+
+@dataclass(frozen=True, slots=True)
+class HotplugEvent:
+    action: str         # "add" / "remove"
+    vendor_id: int
+    product_id: int
+    devpath: str = ""   # sysfs path, e.g. /devices/pci0000:00/.../3-2
+
+    @property
+    def usb_path(self) -> str | None:
+        """Bus/port path in usb_path() form ("3-2", "1-1.4"), None when unknown."""
+        name = self.devpath.rsplit("/", 1)[-1]
+        return name or None
+
+
+EventCallback = Callable[[HotplugEvent], None]
+
+
+class HotplugSource(Protocol):
+    def start(self, callback: EventCallback) -> None: ...
+    def stop(self) -> None: ...
+
+
+# --- Sources ------------------------------------------------------------------
+
+class FakeHotplugSource:
+    """Delivers events passed to emit() synchronously."""
+
+    def __init__(self) -> None:
+        self._callback: EventCallback | None = None
+
+    def start(self, callback: EventCallback) -> None:
+        self._callback = callback
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def emit(self, event: HotplugEvent) -> None:
+        if self._callback is not None:
+            self._callback(event)
+
+
+_NETLINK_KOBJECT_UEVENT = 15
+_KERNEL_GROUP = 1
+
+
+def parse_uevent(raw: bytes) -> HotplugEvent | None:
+    """
+    Parse one kernel uevent datagram ("action@devpath\\0KEY=VALUE\\0...").
+    Returns None for anything but USB device add/remove.
+    """
+    parts = raw.split(b"\0")
+    env: dict[str, str] = {}
+    for part in parts[1:]:
+        key, sep, value = part.partition(b"=")
+        if sep:
+            env[key.decode("ascii", "replace")] = value.decode("ascii", "replace")
+
+    action = env.get("ACTION")
+    if action not in ("add", "remove"):
+        return None
+    if env.get("SUBSYSTEM") != "usb" or env.get("DEVTYPE") != "usb_device":
+        return None
+
+    # PRODUCT=644/804e/101 (hex vendor/product/bcdDevice, no padding)
+    fields = env.get("PRODUCT", "").split("/")
+    if len(fields) < 2:
+        return None
+    try:
+        vendor_id, product_id = int(fields[0], 16), int(fields[1], 16)
+    except ValueError:
+        return None
+
+    return HotplugEvent(action, vendor_id, product_id, env.get("DEVPATH", ""))
+
+
+class UeventSource:
+    """Kernel uevent listener on a NETLINK_KOBJECT_UEVENT socket (Linux)."""
+
+    def __init__(self, poll_interval: float = 0.5) -> None:
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def available() -> bool:
+        return hasattr(socket, "AF_NETLINK")
+
+    def start(self, callback: EventCallback) -> None:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_KOBJECT_UEVENT)
+        sock.bind((0, _KERNEL_GROUP))
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(sock, callback), name="hotplug", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self._poll_interval * 2)
+            self._thread = None
+
+    def _run(self, sock: socket.socket, callback: EventCallback) -> None:
+        with sock:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([sock], [], [], self._poll_interval)
+                if not ready:
+                    continue
+                event = parse_uevent(sock.recv(16384))
+                if event is not None:
+                    callback(event)
+
+
+# --- Watcher ------------------------------------------------------------------
+
+# listener(action, descriptor, event)
+HotplugListener = Callable[[str, DeviceDescriptor, HotplugEvent], None]
+
+
+class HotplugWatcher:
+    """Forwards add/remove events of supported devices to a listener."""
+
+    def __init__(
+        self,
+        source: HotplugSource,
+        listener: HotplugListener,
+        supported: tuple[DeviceDescriptor, ...] = SUPPORTED_DEVICES,
+    ) -> None:
+        self._source = source
+        self._listener = listener
+        self._index = index_descriptors(supported)
+
+    def start(self) -> None:
+        self._source.start(self._on_event)
+
+    def stop(self) -> None:
+        self._source.stop()
+
+    def _on_event(self, event: HotplugEvent) -> None:
+        for descriptor in self._index.get((event.vendor_id, event.product_id), ()):
+            self._listener(event.action, descriptor, event)
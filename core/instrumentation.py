@@ -0,0 +1,168 @@
+"""
+Opt-in transfer instrumentation.
+
+InstrumentedTransport wraps any Transport and records, per request type,
+counts, bytes, error classes and a latency histogram into TransferStats.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+
+from core import protocol
+from core.transport import CtrlRequest, Transport
+
+# Friendly names for the requests this tool sends; anything else is shown raw.
+_LABELS: dict[tuple[int, int], str] = {
+    (protocol.PREP_BM, protocol.PREP_B): "prep",
+    (protocol.READ_BM, protocol.COMMAND_POWERSAVE): "read powersave",
+    (protocol.READ_BM, protocol.COMMAND_INPUT_ENABLE): "read input",
+    (protocol.READ_BM, protocol.COMMAND_MONITORING_MODE): "read monitor",
+    (protocol.READ_BM, protocol.COMMAND_ROUTING): "read route",
+    (protocol.WRITE_BM, protocol.COMMAND_SET_POWERSAVE): "write powersave",
+    (protocol.WRITE_BM, protocol.COMMAND_SET_INPUT_ENABLE): "write input",
+    (protocol.WRITE_BM, protocol.COMMAND_SET_MONITORING_MODE): "write monitor",
+    (protocol.WRITE_BM, protocol.COMMAND_SET_ROUTING): "write route",
+}
+
+
+def request_label(bm_request_type: int, b_request: int) -> str:
+    label = _LABELS.get((bm_request_type, b_request))
+    if label is not None:
+        return label
+    direction = "in" if bm_request_type & 0x80 else "out"
+    return f"{direction} bm=0x{bm_request_type:02x} b=0x{b_request:02x}"
+
+
+# Latency buckets: 10 us .. ~20 s, geometric (x1.25), so memory stays fixed
+_BUCKET_BOUNDS_S: list[float] = []
+_b = 10e-6
+while _b < 20.0:
+    _BUCKET_BOUNDS_S.append(_b)
+    _b *= 1.25
+del _b
+
+
+@dataclass(slots=True)
+class _RequestStats:
+    count: int = 0
+    bytes: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+    errors: dict[str, int] = field(default_factory=dict)
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(_BUCKET_BOUNDS_S) + 1))
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the q-th quantile."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return min(_BUCKET_BOUNDS_S[i], self.max_s) if i < len(_BUCKET_BOUNDS_S) else self.max_s
+        return self.max_s
+
+
+class TransferStats:
+    """Thread-safe per-request-type counters and latency histograms."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_label: dict[str, _RequestStats] = {}
+
+    def record(self, label: str, seconds: float, nbytes: int, error: BaseException | None = None) -> None:
+        with self._lock:
+            s = self._by_label.get(label)
+            if s is None:
+                s = self._by_label[label] = _RequestStats()
+            s.count += 1
+            s.bytes += nbytes
+            s.total_s += seconds
+            s.max_s = max(s.max_s, seconds)
+            s.buckets[bisect.bisect_left(_BUCKET_BOUNDS_S, seconds)] += 1
+            if error is not None:
+                name = type(error).__name__
+                s.errors[name] = s.errors.get(name, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_label.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """JSON-friendly copy: {label: {count, bytes, errors, p50_ms, p95_ms, p99_ms, max_ms, total_ms}}."""
+        with self._lock:
+            return {
+                label: {
+                    "count": s.count,
+                    "bytes": s.bytes,
+                    "errors": dict(s.errors),
+                    "p50_ms": s.percentile(0.50) * 1000,
+                    "p95_ms": s.percentile(0.95) * 1000,
+                    "p99_ms": s.percentile(0.99) * 1000,
+                    "max_ms": s.max_s * 1000,
+                    "total_ms": s.total_s * 1000,
+                }
+                for label, s in sorted(self._by_label.items())
+            }
+
+
+def format_stats(snapshot: dict[str, dict]) -> str:
+    """Plain-text table of a TransferStats.snapshot()."""
+    if not snapshot:
+        return "No transfers recorded."
+
+    header = f"{'request':<18}{'count':>7}{'bytes':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}  errors"
+    lines = [header, "-" * len(header)]
+    for label, s in snapshot.items():
+        errors = ", ".join(f"{k}={v}" for k, v in s["errors"].items()) or "-"
+        lines.append(
+            f"{label:<18}{s['count']:>7}{s['bytes']:>8}"
+            f"{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}  {errors}"
+        )
+    return "\n".join(lines)
+
+
+class InstrumentedTransport:
+    """Transport wrapper that times every transfer into a TransferStats."""
+
+    def __init__(self, inner: Transport, stats: TransferStats | None = None) -> None:
+        self.inner = inner
+        self.stats = stats if stats is not None else TransferStats()
+
+    def open(self) -> None:
+        self.inner.open()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def is_open(self) -> bool:
+        return self.inner.is_open()
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        label = request_label(req.bm_request_type, req.b_request)
+        start = time.perf_counter()
+        try:
+            data = self.inner.ctrl_transfer_in(req)
+        except Exception as e:
+            self.stats.record(label, time.perf_counter() - start, 0, e)
+            raise
+        self.stats.record(label, time.perf_counter() - start, len(data))
+        return data
+
+    def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                          w_value: int, w_index: int, data: bytes,
+                          timeout_ms: int = 1000) -> int:
+        label = request_label(bm_request_type, b_request)
+        start = time.perf_counter()
+        try:
+            written = self.inner.ctrl_transfer_out(bm_request_type, b_request, w_value, w_index, data, timeout_ms)
+        except Exception as e:
+            self.stats.record(label, time.perf_counter() - start, 0, e)
+            raise
+        self.stats.record(label, time.perf_counter() - start, len(data))
+        return written
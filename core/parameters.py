@@ -0,0 +1,250 @@
+"""
+Declarative parameter schema, one per device model.
+
+A schema lists the device's parameter groups (read/write command, the
+CLI-native name of each index, value names and labels). Lookup tables
+for encode/decode are built once from it and shared by the CLI
+(cli_core), read_state, DeviceManager and the GUI, so supporting a new
+model is a data change as long as its parameters map onto DeviceState's
+fields; a new kind of parameter still needs a DeviceState field.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+from core.device_state import DeviceState
+from core import protocol
+
+
+@dataclass(frozen=True, slots=True)
+class ParameterGroup:
+    name: str                       # CLI group name (read -c NAME)
+    read_command: int
+    write_command: int
+    field: str                      # DeviceState attribute; list unless `scalar`
+    keys: tuple[str, ...]           # CLI-native key per index (IN1, LINE12, ...)
+    choices: tuple[str, ...]        # CLI-native value names, by raw value
+    labels: tuple[str, ...]         # human-readable value names, by raw value
+    message: str                    # read output, formatted with (index, label)
+    scalar: bool = False            # DeviceState field holds a single value
+    boolean: bool = False           # DeviceState stores bool rather than int
+    key_aliases: Mapping[str, str] = field(default_factory=dict)
+    value_aliases: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class Parameter:
+    key: str                # CLI-native identifier (LINE12, IN3, POWERSAVE, ...)
+    read_command: int
+    write_command: int
+    index: int
+    field: str              # DeviceState attribute holding the value
+    slot: int | None = None # position inside list fields
+    choices: tuple[str, ...] = ("OFF", "ON")  # CLI-native value names, by raw value
+    group: str = ""
+
+
+class DeviceSchema:
+    """
+    Parameters of one device model. Group order is the order parameters are
+    listed, planned and written in.
+    """
+
+    def __init__(self, name: str, groups: tuple[ParameterGroup, ...]) -> None:
+        self.name = name
+        self.groups = groups
+        self.groups_by_name: dict[str, ParameterGroup] = {g.name: g for g in groups}
+
+        # Group name -> {upper-case key or alias: index} / {upper-case value name or alias: raw value}
+        self.index_by_name: dict[str, dict[str, int]] = {}
+        self.value_by_name: dict[str, dict[str, int]] = {}
+
+        parameters: list[Parameter] = []
+        for g in groups:
+            indices = {k: i for i, k in enumerate(g.keys)}
+            indices.update({a.upper(): indices[k] for a, k in g.key_aliases.items()})
+            self.index_by_name[g.name] = indices
+
+            values = {c: v for v, c in enumerate(g.choices)}
+            values.update({a.upper(): values[c] for a, c in g.value_aliases.items()})
+            self.value_by_name[g.name] = values
+
+            for i, key in enumerate(g.keys):
+                parameters.append(Parameter(
+                    key, g.read_command, g.write_command, i, g.field,
+                    None if g.scalar else i, g.choices, g.name,
+                ))
+
+        self.parameters: tuple[Parameter, ...] = tuple(parameters)
+        self.by_key: dict[str, Parameter] = {p.key: p for p in parameters}
+        # DeviceState field -> its parameters in slot order (one for scalar fields)
+        self.params_by_field: dict[str, tuple[Parameter, ...]] = {
+            g.field: tuple(p for p in parameters if p.group == g.name) for g in groups
+        }
+
+        # (read command, index) pairs of a full snapshot
+        self.snapshot_params: list[tuple[int, int]] = [(p.read_command, p.index) for p in parameters]
+
+    def group(self, name: str) -> ParameterGroup:
+        try:
+            return self.groups_by_name[name.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown parameter group: {name}") from None
+
+    def index_of(self, group: str, name: str) -> int | None:
+        """Index of a key (or key alias) within a group; None if it has none."""
+        return self.index_by_name[group].get(name.upper())
+
+    def value_of(self, group: str, name: str) -> int | None:
+        """Raw value of a value name (or alias) within a group; None if unknown."""
+        return self.value_by_name[group].get(name.upper())
+
+    def parameter(self, key: str) -> Parameter:
+        try:
+            return self.by_key[key.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown parameter: {key}") from None
+
+    def new_state(self) -> DeviceState:
+        """DeviceState sized for this model, all values 0/False."""
+        state = DeviceState()
+        for g in self.groups:
+            zero = False if g.boolean else 0
+            setattr(state, g.field, zero if g.scalar else [zero] * len(g.keys))
+        return state
+
+
+# --- US-4x4 -------------------------------------------------------------------
+
+_ON_OFF = ("OFF", "ON")
+
+US4X4_SCHEMA = DeviceSchema("US-4x4", (
+    ParameterGroup(
+        name="ROUTE",
+        read_command=protocol.COMMAND_ROUTING,
+        write_command=protocol.COMMAND_SET_ROUTING,
+        field="routing",
+        keys=("LINE12", "LINE34"),
+        choices=("MIX", "OUT12", "OUT34"),
+        labels=("Monitor Mix", "PC 1 & 2", "PC 3 & 4"),
+        message="Channel Pair {} is playing back {}",
+        key_aliases={"LINE OUT 1/2": "LINE12", "LINE OUT 3/4": "LINE34"},
+        value_aliases={"INPUT/COMPUTER MIX": "MIX", "COMPUTER OUT 1/2": "OUT12", "COMPUTER OUT 3/4": "OUT34"},
+    ),
+    ParameterGroup(
+        name="MONITOR",
+        read_command=protocol.COMMAND_MONITORING_MODE,
+        write_command=protocol.COMMAND_SET_MONITORING_MODE,
+        field="monitoring_mode",
+        keys=("IN12", "IN34"),
+        choices=("MONO", "STEREO"),
+        labels=("Mono", "Stereo"),
+        message="Channel Pair {} is monitored in {}",
+    ),
+    ParameterGroup(
+        name="INPUT",
+        read_command=protocol.COMMAND_INPUT_ENABLE,
+        write_command=protocol.COMMAND_SET_INPUT_ENABLE,
+        field="input_enable",
+        keys=("IN1", "IN2", "IN3", "IN4"),
+        choices=_ON_OFF,
+        labels=("Off", "On"),
+        message="Input {} is {}",
+        boolean=True,
+        key_aliases={"IN 1": "IN1", "IN 2": "IN2", "IN 3": "IN3", "IN 4": "IN4"},
+    ),
+    ParameterGroup(
+        name="POWERSAVE",
+        read_command=protocol.COMMAND_POWERSAVE,
+        write_command=protocol.COMMAND_SET_POWERSAVE,
+        field="powersave",
+        keys=("POWERSAVE",),
+        choices=_ON_OFF,
+        labels=("Off", "On"),
+        message="Auto-powersave {} is {}",
+        scalar=True,
+        boolean=True,
+    ),
+))
+
+DEFAULT_SCHEMA = US4X4_SCHEMA
+
+# Default-schema views, kept for the existing call sites
+PARAMETERS: tuple[Parameter, ...] = DEFAULT_SCHEMA.parameters
+PARAMETERS_BY_KEY: dict[str, Parameter] = DEFAULT_SCHEMA.by_key
+
+
+def get_parameter(key: str, schema: DeviceSchema = DEFAULT_SCHEMA) -> Parameter:
+    return schema.parameter(key)
+
+
+def encode(key: str, name: str, schema: DeviceSchema = DEFAULT_SCHEMA) -> int:
+    """CLI-native value name -> raw value (e.g. ("LINE34", "OUT12") -> 1)."""
+    p = schema.parameter(key)
+    value = schema.value_of(p.group, name)
+    if value is None:
+        raise ValueError(f"Invalid value for {p.key}: {name}")
+    return value
+
+
+def decode(key: str, value: int, schema: DeviceSchema = DEFAULT_SCHEMA) -> str:
+    """Raw value -> CLI-native value name; unknown values are shown as numbers."""
+    p = schema.parameter(key)
+    if 0 <= value < len(p.choices):
+        return p.choices[value]
+    return str(value)
+
+
+def get_value(state: DeviceState, key: str, schema: DeviceSchema = DEFAULT_SCHEMA) -> int:
+    p = schema.parameter(key)
+    value = getattr(state, p.field)
+    if p.slot is not None:
+        value = value[p.slot]
+    return int(value)
+
+
+def set_value(state: DeviceState, key: str, value: int, schema: DeviceSchema = DEFAULT_SCHEMA) -> None:
+    p = schema.parameter(key)
+    if schema.groups_by_name[p.group].boolean:
+        value = bool(value)
+    else:
+        value = int(value)
+
+    if p.slot is None:
+        setattr(state, p.field, value)
+    else:
+        getattr(state, p.field)[p.slot] = value
+
+
+def state_values(state: DeviceState, schema: DeviceSchema = DEFAULT_SCHEMA) -> dict[str, int]:
+    """Flatten a DeviceState into {parameter key: raw value}."""
+    return {p.key: get_value(state, p.key, schema) for p in schema.parameters}
+
+
+def diff_states(old: DeviceState | None, new: DeviceState, schema: DeviceSchema = DEFAULT_SCHEMA) -> dict[str, int]:
+    """
+    Parameters whose value differs between two states, mapped to the new value.
+    With no previous state every parameter counts as changed.
+
+    Compares field by field and only looks at slots of fields that differ,
+    so equal states cost one comparison.
+    """
+    if old is None:
+        return state_values(new, schema)
+    if old == new:
+        return {}
+
+    changes: dict[str, int] = {}
+    for field_name, params in schema.params_by_field.items():
+        old_field = getattr(old, field_name)
+        new_field = getattr(new, field_name)
+        if old_field == new_field:
+            continue
+        for p in params:
+            if p.slot is None:
+                changes[p.key] = int(new_field)
+            elif old_field[p.slot] != new_field[p.slot]:
+                changes[p.key] = int(new_field[p.slot])
+    return changes
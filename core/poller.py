@@ -0,0 +1,97 @@
+""" Background state polling for a DeviceManager. """
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from core.parameters import get_value
+
+if TYPE_CHECKING:
+    from core.device_manager import DeviceManager
+
+
+class StatePoller:
+    """
+    Polls a connected DeviceManager on a worker thread.
+
+    Each tick reads only a cheap sentinel parameter; the full state is read
+    (DeviceManager.refresh, which notifies subscribers of changed keys) at
+    least every `full_interval` seconds, or right away when the sentinel
+    moves, so a front-panel change to any parameter shows up within that time.
+    While nothing changes the interval grows by `backoff` up to
+    `max_interval`; any change drops it back to `interval`.
+    """
+
+    def __init__(
+        self,
+        manager: DeviceManager,
+        *,
+        interval: float = 0.25,
+        max_interval: float = 2.0,
+        backoff: float = 1.5,
+        full_interval: float = 2.0,
+        sentinel: str = "POWERSAVE",
+    ) -> None:
+        self._manager = manager
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.full_interval = full_interval
+        self.sentinel = sentinel
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="state-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def poll_once(self, *, full: bool = True) -> dict[str, int]:
+        """Run one tick synchronously; returns the changes that were emitted."""
+        cached = self._manager.state
+        if not full and cached is not None:
+            value = self._manager.read_param(self.sentinel)
+            if value is None or value == get_value(cached, self.sentinel, self._manager.schema):
+                return {}
+
+        return self._manager.refresh()
+
+    def _run(self) -> None:
+        delay = self.interval
+        last_full: float | None = None
+
+        while not self._stop.is_set():
+            if self._manager.connected:
+                now = time.monotonic()
+                full = last_full is None or now - last_full >= self.full_interval
+                if full:
+                    last_full = now
+                try:
+                    changed = bool(self.poll_once(full=full))
+                except Exception:
+                    changed = False
+                delay = self.interval if changed else min(self.max_interval, delay * self.backoff)
+                # Wake up in time for the next full read
+                wait = min(delay, max(0.0, last_full + self.full_interval - time.monotonic()))
+            else:
+                # Nothing to talk to; wait for a reconnect at the slow rate.
+                last_full = None
+                wait = self.max_interval
+
+            self._stop.wait(wait)
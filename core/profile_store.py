@@ -0,0 +1,222 @@
+"""
+Saved profiles, indexed in memory and written without rewriting the file.
+
+The store is a JSON snapshot ({"devices": {key: {"profiles": {name: ...}}}},
+the format the GUI always used) plus a journal of JSON lines, one per
+put/delete since the snapshot. Saving appends one line; after
+COMPACT_AFTER lines the snapshot is rewritten through a temp file and an
+atomic rename and the journal is dropped. Reads come from the index,
+which is rebuilt only when either file's mtime or size changes (another
+process saved). Saving, compacting and rebuilding hold an flock on a
+sibling ".lock" file, so processes sharing the store never cut or drop
+each other's journal lines. A corrupt file raises ProfileStoreError
+instead of being replaced.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+Profile = dict[str, Any]
+
+
+class ProfileStoreError(RuntimeError):
+    pass
+
+
+def _stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to path so readers see either the old or the new file, never a mix."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class ProfileStore:
+    COMPACT_AFTER = 256
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + ".journal")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        # device key -> profile name -> profile
+        self._index: dict[str, dict[str, Profile]] = {}
+        self._journal_lines = 0
+        self._stamps: tuple | None = None
+        self._lock = threading.Lock()
+
+    # --- Reads -----------------------------------------------------------------
+
+    def devices(self) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return [key for key, profiles in self._index.items() if profiles]
+
+    def names(self, device_key: str) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._index.get(device_key, {}))
+
+    def get(self, device_key: str, name: str) -> Profile | None:
+        with self._lock:
+            self._refresh()
+            profile = self._index.get(device_key, {}).get(name)
+            return dict(profile) if profile is not None else None
+
+    def profiles(self, device_key: str) -> dict[str, Profile]:
+        with self._lock:
+            self._refresh()
+            return {name: dict(p) for name, p in self._index.get(device_key, {}).items()}
+
+    # --- Writes ----------------------------------------------------------------
+
+    def put(self, device_key: str, name: str, profile: Profile) -> None:
+        with self._lock, self._locked():
+            self._sync()
+            self._append({"op": "put", "device": device_key, "name": name, "profile": profile})
+            self._index.setdefault(device_key, {})[name] = dict(profile)
+            self._after_write()
+
+    def delete(self, device_key: str, name: str) -> bool:
+        with self._lock, self._locked():
+            self._sync()
+            if name not in self._index.get(device_key, {}):
+                return False
+            self._append({"op": "delete", "device": device_key, "name": name})
+            del self._index[device_key][name]
+            self._after_write()
+            return True
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot."""
+        with self._lock, self._locked():
+            self._sync()
+            self._compact()
+
+    # --- Internals -------------------------------------------------------------
+
+    def _file_stamps(self) -> tuple:
+        return _stamp(self.path), _stamp(self.journal_path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock shared with every process using this store."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            # Closing the descriptor releases the flock
+            os.close(fd)
+
+    def _refresh(self) -> None:
+        stamps = self._file_stamps()
+        if stamps == self._stamps:
+            return
+        if stamps == (None, None):
+            # Nothing saved yet; no need to create the lock file for that
+            self._index, self._journal_lines, self._stamps = {}, 0, stamps
+            return
+        with self._locked():
+            self._sync()
+
+    def _sync(self) -> None:
+        """Rebuild the index if another process saved. Caller holds _locked()."""
+        stamps = self._file_stamps()
+        if stamps == self._stamps:
+            return
+        index = self._read_snapshot()
+        self._journal_lines = self._replay_journal(index)
+        self._index = index
+        self._stamps = self._file_stamps()
+
+    def _read_snapshot(self) -> dict[str, dict[str, Profile]]:
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return {}
+        try:
+            devices = json.loads(text)["devices"]
+            return {key: dict(dev["profiles"]) for key, dev in devices.items()}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ProfileStoreError(f"{self.path} is not a valid profile file: {e}") from e
+
+    def _replay_journal(self, index: dict[str, dict[str, Profile]]) -> int:
+        try:
+            data = self.journal_path.read_bytes()
+        except FileNotFoundError:
+            return 0
+
+        lines = data.split(b"\n")
+        # A torn last line is a save that died half way (appends hold the
+        # lock); cut it off so the next append starts on a clean line.
+        if lines[-1]:
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(len(data) - len(lines[-1]))
+        lines = lines[:-1]
+
+        for number, line in enumerate(lines, start=1):
+            try:
+                entry = json.loads(line)
+                profiles = index.setdefault(entry["device"], {})
+                if entry["op"] == "put":
+                    profiles[entry["name"]] = entry["profile"]
+                elif entry["op"] == "delete":
+                    profiles.pop(entry["name"], None)
+                else:
+                    raise ValueError(f"unknown op {entry['op']!r}")
+            except (ValueError, KeyError, TypeError) as e:
+                raise ProfileStoreError(f"{self.journal_path}:{number}: {e}") from e
+        return len(lines)
+
+    def _append(self, entry: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_lines += 1
+
+    def _after_write(self) -> None:
+        if self._journal_lines >= self.COMPACT_AFTER:
+            self._compact()
+        else:
+            self._stamps = self._file_stamps()
+
+    def _compact(self) -> None:
+        data = {"devices": {key: {"profiles": profiles} for key, profiles in self._index.items() if profiles}}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, json.dumps(data, indent=2, ensure_ascii=False))
+        # The snapshot now holds everything; replaying a leftover journal would be harmless
+        try:
+            self.journal_path.unlink()
+        except FileNotFoundError:
+            pass
+        self._journal_lines = 0
+        self._stamps = self._file_stamps()
@@ -0,0 +1,87 @@
+""" Profiles as typed device state snapshots, and what recalling one would change. """
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from core.device_state import DeviceState
+from core.parameters import DEFAULT_SCHEMA, DeviceSchema, diff_states, encode, set_value
+
+# 1: {"planned_lines": {key: display text}, "planned_values": {key: value name}};
+#    the first GUI releases saved planned_lines only
+# 2: {"version": 2, "state": DeviceState.to_dict(), "keys": [...] | None}
+PROFILE_VERSION = 2
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    state: DeviceState
+    # Parameters the profile sets; None means all of them
+    keys: tuple[str, ...] | None = None
+
+
+def profile_to_dict(profile: Profile) -> dict[str, Any]:
+    return {
+        "version": PROFILE_VERSION,
+        "state": profile.state.to_dict(),
+        "keys": list(profile.keys) if profile.keys is not None else None,
+    }
+
+
+def profile_from_dict(data: dict[str, Any], schema: DeviceSchema = DEFAULT_SCHEMA) -> Profile:
+    """
+    Read a stored profile. Version 1 profiles (planned value names only)
+    become partial snapshots covering just the keys they planned; ones
+    without planned_values are read back from their planned lines.
+    Raises ValueError on anything malformed.
+    """
+    version = data.get("version", 1)
+
+    if version == 1:
+        if "planned_values" in data:
+            values = {key: encode(key, name, schema) for key, name in data["planned_values"].items()}
+        else:
+            values = {key: _value_from_line(key, text, schema) for key, text in data.get("planned_lines", {}).items()}
+        state = schema.new_state()
+        for key, value in values.items():
+            set_value(state, key, value, schema)
+        return Profile(state, tuple(schema.parameter(k).key for k in values))
+
+    if version == PROFILE_VERSION:
+        keys = data.get("keys")
+        if keys is not None:
+            keys = tuple(schema.parameter(k).key for k in keys)
+        return Profile(DeviceState.from_dict(data["state"]), keys)
+
+    raise ValueError(f"Unsupported profile version: {version!r}")
+
+
+def _value_from_line(key: str, text: str, schema: DeviceSchema) -> int:
+    """
+    Raw value of a planned line such as "Routing Line 1/2: Monitor Mix".
+    The part after the colon is a value name, alias or label of the key's group.
+    """
+    group = schema.groups_by_name[schema.parameter(key).group]
+    name = text.rpartition(":")[2].strip()
+    try:
+        return encode(key, name, schema)
+    except ValueError:
+        pass
+    for value, label in enumerate(group.labels):
+        if label.upper() == name.upper():
+            return value
+    raise ValueError(f"Can't read the planned value for {key}: {text!r}")
+
+
+def recall_changes(
+    profile: Profile,
+    current: DeviceState | None,
+    schema: DeviceSchema = DEFAULT_SCHEMA,
+) -> dict[str, int]:
+    """{parameter key: raw value} that recalling the profile has to write over `current`."""
+    changes = diff_states(current, profile.state, schema)
+    if profile.keys is not None:
+        keys = set(profile.keys)
+        changes = {k: v for k, v in changes.items() if k in keys}
+    return changes
@@ -1,26 +1,47 @@
-# core/protocol.py
+""" US-4x4 communication protocol helpers. """
+
 from __future__ import annotations
 
-""" US-4x4 communication protocol helpers. """
+from typing import Sequence
 
-from core.transport import Transport, CtrlRequest
+from core.transport import AsyncTransport, Transport, CtrlRequest, Disconnected, Stalled, TransportError
 
 COMMAND_POWERSAVE = 0x03
 COMMAND_INPUT_ENABLE = 0x05
 COMMAND_MONITORING_MODE = 0x07
 COMMAND_ROUTING = 0x09
 
-INDICES_POWERSAVE = [0]
-INDICES_INPUT_ENABLE = [0, 1, 2, 3]
-INDICES_MONITORING_MODE = [0, 1]
-INDICES_ROUTING = [0, 1]
+# Write requests use the read command + 1.
+# Indices and value meanings live in core.parameters (per-device schema).
+COMMAND_SET_POWERSAVE = 0x04
+COMMAND_SET_INPUT_ENABLE = 0x06
+COMMAND_SET_MONITORING_MODE = 0x08
+COMMAND_SET_ROUTING = 0x0A
+
+PREP_BM = 0xA1
+PREP_B = 2
+PREP_WVALUE = 0x0100
+PREP_WINDEX = 0x2900
 
-_PREP_BM = 0xA1
-_PREP_B = 2
-_PREP_WVALUE = 0x0100
-_PREP_WINDEX = 0x2900
+READ_BM = 0xC0
+WRITE_BM = 0x40
 
-_READ_BM = 0xC0
+# Set on a transport (instance attribute) once its device has rejected a
+# read/write without its own prep handshake and accepted it with one.
+_PREP_PER_READ = "_tascam_prep_per_read"
+_PREP_PER_WRITE = "_tascam_prep_per_write"
+
+
+def _prep(transport: Transport) -> None:
+    transport.ctrl_transfer_in(CtrlRequest(PREP_BM, PREP_B, PREP_WVALUE, PREP_WINDEX, 16))
+    transport.ctrl_transfer_in(CtrlRequest(PREP_BM, PREP_B, PREP_WVALUE, PREP_WINDEX, 50))
+
+
+def _read(transport: Transport, command: int, index: int) -> int:
+    data = transport.ctrl_transfer_in(CtrlRequest(READ_BM, command, 0, index, 1))
+    if not data:
+        raise TransportError(f"Empty reply for command 0x{command:02x} index {index}")
+    return data[0]
 
 
 def read_byte(transport: Transport, command: int, index: int) -> int:
@@ -32,8 +53,148 @@ def read_byte(transport: Transport, command: int, index: int) -> int:
       - prep ctrl_transfer (len 50)
       - read ctrl_transfer (len 1) -> result[0]
     """
-    transport.ctrl_transfer_in(CtrlRequest(_PREP_BM, _PREP_B, _PREP_WVALUE, _PREP_WINDEX, 16))
-    transport.ctrl_transfer_in(CtrlRequest(_PREP_BM, _PREP_B, _PREP_WVALUE, _PREP_WINDEX, 50))
+    _prep(transport)
+    return _read(transport, command, index)
+
+
+def read_bytes(transport: Transport, params: Sequence[tuple[int, int]]) -> list[int]:
+    """
+    Read several byte parameters given as (command, index) pairs.
+
+    The prep handshake is sent once and shared by the whole batch.
+    If the device rejects (stalls) a read that had no prep of its own and
+    then accepts it with a full prep, the transport is remembered as
+    needing per-read prep (the read_byte sequence) from then on. Other
+    errors, such as a timeout, are retried once with a prep but not
+    remembered.
+    """
+    values: list[int] = []
+    for pos, (command, index) in enumerate(params):
+        if pos == 0 or getattr(transport, _PREP_PER_READ, False):
+            values.append(read_byte(transport, command, index))
+            continue
+
+        try:
+            values.append(_read(transport, command, index))
+        except Disconnected:
+            raise
+        except Stalled:
+            values.append(read_byte(transport, command, index))
+            setattr(transport, _PREP_PER_READ, True)
+        except TransportError:
+            values.append(read_byte(transport, command, index))
+
+    return values
+
+
+def write_byte(transport: Transport, command: int, index: int, value: int) -> None:
+    """
+    Write a single byte parameter to the device.
+
+    Known sequence:
+      - prep ctrl_transfer (len 16)
+      - prep ctrl_transfer (len 50)
+      - write ctrl_transfer (wValue=value, wIndex=index, no data)
+    """
+    _prep(transport)
+    transport.ctrl_transfer_out(WRITE_BM, command, value, index, b"")
+
+
+def write_bytes(transport: Transport, writes: Sequence[tuple[int, int, int]]) -> None:
+    """
+    Write several byte parameters given as (command, index, value) triples,
+    in order, sharing one prep handshake.
+
+    Falls back to per-write prep the same way read_bytes does.
+    """
+    for pos, (command, index, value) in enumerate(writes):
+        if pos == 0 or getattr(transport, _PREP_PER_WRITE, False):
+            write_byte(transport, command, index, value)
+            continue
 
-    data = transport.ctrl_transfer_in(CtrlRequest(_READ_BM, command, 0, index, 1))
+        try:
+            transport.ctrl_transfer_out(WRITE_BM, command, value, index, b"")
+        except Disconnected:
+            raise
+        except Stalled:
+            write_byte(transport, command, index, value)
+            setattr(transport, _PREP_PER_WRITE, True)
+        except TransportError:
+            write_byte(transport, command, index, value)
+
+
+def set_powersave(transport: Transport, enabled: bool) -> None:
+    write_byte(transport, COMMAND_SET_POWERSAVE, 0, int(enabled))
+
+
+def set_input_enable(transport: Transport, index: int, enabled: bool) -> None:
+    write_byte(transport, COMMAND_SET_INPUT_ENABLE, index, int(enabled))
+
+
+def set_monitoring_mode(transport: Transport, index: int, mode: int) -> None:
+    write_byte(transport, COMMAND_SET_MONITORING_MODE, index, mode)
+
+
+def set_routing(transport: Transport, index: int, source: int) -> None:
+    write_byte(transport, COMMAND_SET_ROUTING, index, source)
+
+
+# --- asyncio variants (same sequences over an AsyncTransport) -----------------
+
+async def _prep_async(transport: AsyncTransport) -> None:
+    await transport.ctrl_transfer_in(CtrlRequest(PREP_BM, PREP_B, PREP_WVALUE, PREP_WINDEX, 16))
+    await transport.ctrl_transfer_in(CtrlRequest(PREP_BM, PREP_B, PREP_WVALUE, PREP_WINDEX, 50))
+
+
+async def _read_async(transport: AsyncTransport, command: int, index: int) -> int:
+    data = await transport.ctrl_transfer_in(CtrlRequest(READ_BM, command, 0, index, 1))
+    if not data:
+        raise TransportError(f"Empty reply for command 0x{command:02x} index {index}")
     return data[0]
+
+
+async def read_byte_async(transport: AsyncTransport, command: int, index: int) -> int:
+    await _prep_async(transport)
+    return await _read_async(transport, command, index)
+
+
+async def read_bytes_async(transport: AsyncTransport, params: Sequence[tuple[int, int]]) -> list[int]:
+    """See read_bytes."""
+    values: list[int] = []
+    for pos, (command, index) in enumerate(params):
+        if pos == 0 or getattr(transport, _PREP_PER_READ, False):
+            values.append(await read_byte_async(transport, command, index))
+            continue
+
+        try:
+            values.append(await _read_async(transport, command, index))
+        except Disconnected:
+            raise
+        except Stalled:
+            values.append(await read_byte_async(transport, command, index))
+            setattr(transport, _PREP_PER_READ, True)
+        except TransportError:
+            values.append(await read_byte_async(transport, command, index))
+
+    return values
+
+
+async def write_byte_async(transport: AsyncTransport, command: int, index: int, value: int) -> None:
+    await _prep_async(transport)
+    await transport.ctrl_transfer_out(WRITE_BM, command, value, index, b"")
+
+
+async def set_powersave_async(transport: AsyncTransport, enabled: bool) -> None:
+    await write_byte_async(transport, COMMAND_SET_POWERSAVE, 0, int(enabled))
+
+
+async def set_input_enable_async(transport: AsyncTransport, index: int, enabled: bool) -> None:
+    await write_byte_async(transport, COMMAND_SET_INPUT_ENABLE, index, int(enabled))
+
+
+async def set_monitoring_mode_async(transport: AsyncTransport, index: int, mode: int) -> None:
+    await write_byte_async(transport, COMMAND_SET_MONITORING_MODE, index, mode)
+
+
+async def set_routing_async(transport: AsyncTransport, index: int, source: int) -> None:
+    await write_byte_async(transport, COMMAND_SET_ROUTING, index, source)
@@ -1,35 +1,30 @@
-# core/read_state.py
 from __future__ import annotations
 
 from core.device_state import DeviceState
-from core.transport import Transport
+from core.parameters import DEFAULT_SCHEMA, DeviceSchema, set_value
+from core.transport import AsyncTransport, Transport
 from core import protocol
 
 
-def read_state(transport: Transport) -> DeviceState:
+def read_state(transport: Transport, schema: DeviceSchema = DEFAULT_SCHEMA) -> DeviceState:
     """
     Read current device state from the US-4x4 via Transport.
     Returns a fully-populated DeviceState.
-    """
-    state = DeviceState()
 
-    # powersave (index 0): 0/1
-    ps = protocol.read_byte(transport, protocol.COMMAND_POWERSAVE, 0)
-    state.powersave = bool(ps)
+    All parameters of the schema are fetched in one batch (see
+    protocol.read_bytes), so the prep handshake is paid once per snapshot
+    where the device allows it.
+    """
+    return _state_from_values(protocol.read_bytes(transport, schema.snapshot_params), schema)
 
-    # input enable (indices 0..3): 0/1
-    for i in protocol.INDICES_INPUT_ENABLE:
-        v = protocol.read_byte(transport, protocol.COMMAND_INPUT_ENABLE, i)
-        state.input_enable[i] = bool(v)
 
-    # monitoring mode (indices 0..1): 0=Mono, 1=Stereo
-    for i in protocol.INDICES_MONITORING_MODE:
-        v = protocol.read_byte(transport, protocol.COMMAND_MONITORING_MODE, i)
-        state.monitoring_mode[i] = int(v)
+async def read_state_async(transport: AsyncTransport, schema: DeviceSchema = DEFAULT_SCHEMA) -> DeviceState:
+    """read_state over an AsyncTransport."""
+    return _state_from_values(await protocol.read_bytes_async(transport, schema.snapshot_params), schema)
 
-    # routing (indices 0..1): device-defined enum index
-    for i in protocol.INDICES_ROUTING:
-        v = protocol.read_byte(transport, protocol.COMMAND_ROUTING, i)
-        state.routing[i] = int(v)
 
+def _state_from_values(values: list[int], schema: DeviceSchema) -> DeviceState:
+    state = schema.new_state()
+    for p, value in zip(schema.parameters, values):
+        set_value(state, p.key, value, schema)
     return state
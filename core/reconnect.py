@@ -0,0 +1,99 @@
+""" Supervised automatic reconnect for a DeviceManager. """
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from core.device_manager import DeviceManager
+
+
+# listener(event, detail): "lost" / "restored" / "gave_up", with a short message
+ReconnectListener = Callable[[str, str], None]
+
+
+class ReconnectSupervisor:
+    """
+    Reconnects a DeviceManager on a worker thread after its circuit breaker
+    opens (see DeviceManager._trip), then restores the state it had.
+
+    Attempts are spaced by exponential backoff from `initial_delay` up to
+    `max_delay`, each wait drawn uniformly from [0, delay] ("full jitter"),
+    so a hub reset is usually recovered on the first try within
+    milliseconds and several units dropping at once don't retry in step.
+    With `max_attempts` set it gives up after that many failed attempts.
+    """
+
+    def __init__(
+        self,
+        manager: DeviceManager,
+        *,
+        initial_delay: float = 0.02,
+        max_delay: float = 5.0,
+        factor: float = 2.0,
+        max_attempts: int | None = None,
+        listener: ReconnectListener | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._manager = manager
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.max_attempts = max_attempts
+        self._listener = listener
+        self._rng = rng or random.Random()
+
+        self._lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reconnect-supervisor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop.set()
+        self._lost.set()
+        thread = self._thread
+        self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def notify_lost(self) -> None:
+        """Called by the manager when the connection drops; never blocks."""
+        self._lost.set()
+
+    def _emit(self, event: str, detail: str) -> None:
+        if self._listener is not None:
+            self._listener(event, detail)
+
+    def _run(self) -> None:
+        while True:
+            self._lost.wait()
+            if self._stop.is_set():
+                return
+            self._lost.clear()
+            self._emit("lost", self._manager.last_error or "Connection lost")
+            self._recover()
+
+    def _recover(self) -> None:
+        delay = self.initial_delay
+        attempts = 0
+        while not self._stop.wait(self._rng.uniform(0, delay)):
+            attempts += 1
+            if self._manager.recover():
+                self._emit("restored", f"Reconnected after {attempts} attempt(s)")
+                return
+            if self.max_attempts is not None and attempts >= self.max_attempts:
+                self._emit("gave_up", self._manager.last_error or "Reconnect failed")
+                return
+            delay = min(self.max_delay, delay * self.factor)
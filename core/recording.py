@@ -0,0 +1,282 @@
+"""
+Record-and-replay of transport sessions.
+
+RecordingTransport wraps a real transport and appends every transfer
+(request, payload, response or error, timing) to a compact binary log
+through a bounded buffer, so hours of polling cost little memory and I/O.
+ReplayTransport plays such a log back without hardware.
+
+Log format: b"TUSBLOG1", then records of
+    <kind:u8 status:u8 t_us:u64 dur_us:u32 bm:u8 b:u8 wValue:u16 wIndex:u16
+     length:u16 timeout_ms:u16 payload_len:u16> payload
+(little endian). Payload is the data sent (out), received (in), or
+"ErrorClass: message" when status is 1.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from core.transport import CtrlRequest, Disconnected, Transport, TransportError, error_from_name
+
+MAGIC = b"TUSBLOG1"
+
+KIND_IN = 0
+KIND_OUT = 1
+KIND_OPEN = 2
+KIND_CLOSE = 3
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+_RECORD = struct.Struct("<BBQIBBHHHHH")
+
+
+@dataclass(frozen=True, slots=True)
+class LogRecord:
+    kind: int
+    status: int
+    t_us: int           # start time, microseconds since the log was opened
+    duration_us: int
+    bm_request_type: int = 0
+    b_request: int = 0
+    w_value: int = 0
+    w_index: int = 0
+    length: int = 0
+    timeout_ms: int = 0
+    payload: bytes = b""
+
+    @property
+    def request_key(self) -> tuple[int, int, int, int, int, int]:
+        return (self.kind, self.bm_request_type, self.b_request, self.w_value, self.w_index, self.length)
+
+    def pack(self) -> bytes:
+        return _RECORD.pack(
+            self.kind, self.status, self.t_us, min(self.duration_us, 0xFFFFFFFF),
+            self.bm_request_type, self.b_request, self.w_value, self.w_index,
+            self.length, min(self.timeout_ms, 0xFFFF), len(self.payload),
+        ) + self.payload
+
+
+# --- Writing ------------------------------------------------------------------
+
+class TransferLogWriter:
+    """Append-only log writer; buffers up to `buffer_size` bytes before writing."""
+
+    def __init__(self, path: str | Path, buffer_size: int = 64 * 1024) -> None:
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(MAGIC)
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        self._t0 = time.perf_counter()
+
+    def now_us(self) -> int:
+        return int((time.perf_counter() - self._t0) * 1_000_000)
+
+    def append(self, record: LogRecord) -> None:
+        self._buffer += record.pack()
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> TransferLogWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RecordingTransport:
+    """Transport wrapper that logs every call of `inner` to a TransferLogWriter."""
+
+    def __init__(self, inner: Transport, log: TransferLogWriter) -> None:
+        self.inner = inner
+        self.log = log
+
+    def _record(self, kind: int, start_us: int, error: BaseException | None,
+                payload: bytes = b"", **fields) -> None:
+        status = STATUS_OK
+        if error is not None:
+            status = STATUS_ERROR
+            payload = f"{type(error).__name__}: {error}".encode("utf-8", "replace")
+        self.log.append(LogRecord(
+            kind, status, start_us, self.log.now_us() - start_us, payload=payload[:0xFFFF], **fields,
+        ))
+
+    def open(self) -> None:
+        start = self.log.now_us()
+        try:
+            self.inner.open()
+        except Exception as e:
+            self._record(KIND_OPEN, start, e)
+            raise
+        self._record(KIND_OPEN, start, None)
+
+    def close(self) -> None:
+        start = self.log.now_us()
+        try:
+            self.inner.close()
+        finally:
+            self._record(KIND_CLOSE, start, None)
+            self.log.flush()
+
+    def is_open(self) -> bool:
+        return self.inner.is_open()
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        fields = dict(
+            bm_request_type=req.bm_request_type, b_request=req.b_request, w_value=req.w_value,
+            w_index=req.w_index, length=req.length, timeout_ms=req.timeout_ms,
+        )
+        start = self.log.now_us()
+        try:
+            data = self.inner.ctrl_transfer_in(req)
+        except Exception as e:
+            self._record(KIND_IN, start, e, **fields)
+            raise
+        self._record(KIND_IN, start, None, data, **fields)
+        return data
+
+    def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                          w_value: int, w_index: int, data: bytes,
+                          timeout_ms: int = 1000) -> int:
+        fields = dict(
+            bm_request_type=bm_request_type, b_request=b_request, w_value=w_value,
+            w_index=w_index, length=len(data), timeout_ms=timeout_ms,
+        )
+        start = self.log.now_us()
+        try:
+            written = self.inner.ctrl_transfer_out(bm_request_type, b_request, w_value, w_index, data, timeout_ms)
+        except Exception as e:
+            self._record(KIND_OUT, start, e, bytes(data), **fields)
+            raise
+        self._record(KIND_OUT, start, None, bytes(data), **fields)
+        return written
+
+
+# --- Reading / replay ---------------------------------------------------------
+
+def read_log(path: str | Path) -> Iterator[LogRecord]:
+    """Stream the records of a log file (a truncated tail record is ignored)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a transfer log")
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            kind, status, t_us, dur_us, bm, b, v, i, length, timeout_ms, n = _RECORD.unpack(head)
+            payload = f.read(n)
+            if len(payload) < n:
+                return
+            yield LogRecord(kind, status, t_us, dur_us, bm, b, v, i, length, timeout_ms, payload)
+
+
+class ReplayMismatch(TransportError):
+    """The replayed session asked for a transfer the log does not have."""
+
+
+class ReplayTransport:
+    """
+    Plays a recorded session back.
+
+    strict=True replays the log in order and fails on any deviation (to
+    reproduce a session exactly). strict=False answers each request from
+    the recorded responses to the same request, in order, repeating the
+    last one once they run out; that lets changed protocol code run
+    against real traffic. With realtime, each transfer takes its recorded
+    duration; in strict mode it also first waits out the recorded gap
+    since the first transfer replayed after open(), so idle time before
+    the device was (re)opened is skipped but the pace after it is kept.
+    """
+
+    def __init__(self, records: str | Path | Iterable[LogRecord], *,
+                 strict: bool = True, realtime: bool = False) -> None:
+        if isinstance(records, (str, Path)):
+            records = read_log(records)
+        self._records = deque(r for r in records if r.kind in (KIND_IN, KIND_OUT))
+        self._strict = strict
+        self._realtime = realtime
+        self._open = False
+        # (time.monotonic(), t_us) of the first transfer replayed since open()
+        self._anchor: tuple[float, int] | None = None
+
+        self._by_key: dict[tuple, deque[LogRecord]] = {}
+        self._last_by_key: dict[tuple, LogRecord] = {}
+        if not strict:
+            for r in self._records:
+                self._by_key.setdefault(r.request_key, deque()).append(r)
+
+    def open(self) -> None:
+        self._open = True
+        self._anchor = None
+
+    def close(self) -> None:
+        self._open = False
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def _next(self, key: tuple) -> LogRecord:
+        if not self._open:
+            raise Disconnected("ReplayTransport is not open")
+
+        if self._strict:
+            if not self._records:
+                raise ReplayMismatch("Replay log exhausted")
+            record = self._records.popleft()
+            if record.request_key != key:
+                raise ReplayMismatch(f"Expected {record.request_key}, got {key}")
+        else:
+            queue = self._by_key.get(key)
+            if queue:
+                record = queue.popleft()
+                self._last_by_key[key] = record
+            elif key in self._last_by_key:
+                record = self._last_by_key[key]
+            else:
+                raise ReplayMismatch(f"No recorded response for {key}")
+
+        if self._realtime:
+            # Out-of-order answers (strict=False) have no meaningful gaps
+            if self._strict:
+                if self._anchor is None:
+                    self._anchor = (time.monotonic(), record.t_us)
+                started, t0_us = self._anchor
+                gap = started + (record.t_us - t0_us) / 1_000_000 - time.monotonic()
+                if gap > 0:
+                    time.sleep(gap)
+            if record.duration_us:
+                time.sleep(record.duration_us / 1_000_000)
+
+        if record.status == STATUS_ERROR:
+            name, _, message = record.payload.decode("utf-8", "replace").partition(": ")
+            raise error_from_name(name, message)
+        return record
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        key = (KIND_IN, req.bm_request_type, req.b_request, req.w_value, req.w_index, req.length)
+        return self._next(key).payload
+
+    def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                          w_value: int, w_index: int, data: bytes,
+                          timeout_ms: int = 1000) -> int:
+        key = (KIND_OUT, bm_request_type, b_request, w_value, w_index, len(data))
+        self._next(key)
+        return len(data)
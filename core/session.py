@@ -0,0 +1,105 @@
+""" Several devices at once: a registry of DeviceManagers keyed by unit identity. """
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Mapping, TypeVar
+
+from core.detector import DetectedDevice, detect_devices
+from core.device_manager import DeviceManager
+from core.device_state import DeviceState
+from core.devices import DeviceDescriptor, SUPPORTED_DEVICES
+from core.instrumentation import TransferStats
+
+T = TypeVar("T")
+
+
+class DeviceSession:
+    """
+    Owns one DeviceManager per physical unit, keyed by DetectedDevice.key
+    (serial number, else bus/port path), so identical models never collide.
+
+    Bulk operations fan out over a worker pool; each manager still
+    serializes its own transfers, but different units run in parallel.
+    """
+
+    def __init__(self, max_workers: int = 8, stats: TransferStats | None = None) -> None:
+        self.stats = stats
+        self._managers: dict[str, DeviceManager] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="device-session")
+
+    # -------------------------
+    # Registry
+    # -------------------------
+
+    def add(self, device: DetectedDevice) -> DeviceManager:
+        with self._lock:
+            dm = self._managers.get(device.key)
+            if dm is None:
+                dm = DeviceManager(device.descriptor, path=device.path, key=device.key, stats=self.stats)
+                self._managers[device.key] = dm
+            return dm
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            dm = self._managers.pop(key, None)
+        if dm is not None:
+            dm.disconnect()
+
+    def get(self, key: str) -> DeviceManager | None:
+        return self._managers.get(key)
+
+    def keys(self) -> list[str]:
+        return list(self._managers)
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+    def __iter__(self) -> Iterator[DeviceManager]:
+        return iter(list(self._managers.values()))
+
+    def discover(self, supported: tuple[DeviceDescriptor, ...] = SUPPORTED_DEVICES) -> list[str]:
+        """Register every unit on the bus; units that vanished are dropped. Returns the keys."""
+        found = detect_devices(supported)
+        for device in found:
+            self.add(device)
+
+        present = {d.key for d in found}
+        for key in self.keys():
+            if key not in present:
+                self.remove(key)
+
+        return [d.key for d in found]
+
+    # -------------------------
+    # Bulk operations
+    # -------------------------
+
+    def map(self, fn: Callable[[DeviceManager], T], keys: Iterable[str] | None = None) -> dict[str, T]:
+        """Run fn on each selected manager in parallel; {key: result}."""
+        selected = {k: self._managers[k] for k in (self.keys() if keys is None else keys)}
+        futures = {k: self._pool.submit(fn, dm) for k, dm in selected.items()}
+        return {k: f.result() for k, f in futures.items()}
+
+    def connect_all(self, keys: Iterable[str] | None = None) -> dict[str, bool]:
+        return self.map(lambda dm: dm.connected or dm.connect(), keys)
+
+    def read_all(self, keys: Iterable[str] | None = None) -> dict[str, DeviceState | None]:
+        return self.map(lambda dm: dm.read_state(), keys)
+
+    def apply_all(
+        self,
+        desired: Mapping[str, int],
+        keys: Iterable[str] | None = None,
+        *,
+        verify: bool = True,
+    ) -> dict[str, int | None]:
+        """Push one configuration to every selected unit at once."""
+        return self.map(lambda dm: dm.apply(desired, verify=verify), keys)
+
+    def close(self) -> None:
+        for key in self.keys():
+            self.remove(key)
+        self._pool.shutdown(wait=True)
@@ -0,0 +1,161 @@
+"""
+Simulated US-4x4 for benchmarks and offline development.
+
+SimulatedTransport behaves like the device (writes are stored and read
+back, prep requests are answered) and adds configurable per-transfer
+latency, jitter, stalls and injected errors. With realtime=False nothing
+sleeps: latency is accumulated on a virtual clock, so benchmarks run at
+full speed yet still report device time.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable
+
+from core.protocol import PREP_BM, READ_BM, WRITE_BM
+from core.transport import CtrlRequest, Disconnected, Stalled, TransportError
+
+# Latency model: rng -> seconds
+LatencyModel = Callable[[random.Random], float]
+
+
+def constant(seconds: float) -> LatencyModel:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyModel:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 0.25) -> LatencyModel:
+    """Long-tailed latency, typical of hubs and busy buses."""
+    import math
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+# Control transfer on a full-speed/high-speed bus through a hub: ~0.3-0.5 ms
+DEFAULT_LATENCY = lognormal(0.0004, 0.2)
+
+
+class SimulatedTransport:
+    def __init__(
+        self,
+        *,
+        latency: LatencyModel | float = DEFAULT_LATENCY,
+        jitter_s: float = 0.0,
+        stall_probability: float = 0.0,
+        stall_s: float = 1.0,
+        error_rate: float = 0.0,
+        disconnect_after: int | None = None,
+        requires_prep: bool = False,
+        open_latency_s: float = 0.05,
+        close_latency_s: float = 0.02,
+        realtime: bool = True,
+        seed: int | None = 0,
+    ) -> None:
+        self.latency: LatencyModel = constant(latency) if isinstance(latency, (int, float)) else latency
+        self.jitter_s = jitter_s
+        self.stall_probability = stall_probability
+        self.stall_s = stall_s
+        self.error_rate = error_rate
+        self.disconnect_after = disconnect_after
+        self.requires_prep = requires_prep
+        self.open_latency_s = open_latency_s
+        self.close_latency_s = close_latency_s
+        self.realtime = realtime
+
+        self._rng = random.Random(seed)
+        self._open = False
+        self._prepped = False
+        # Device registers: (read command, index) -> value
+        self.registers: dict[tuple[int, int], int] = {}
+
+        # Counters
+        self.transfers = 0
+        self.transfers_in = 0
+        self.transfers_out = 0
+        self.errors = 0
+        self.clock_s = 0.0   # simulated device time spent
+
+    def reset_counters(self) -> None:
+        self.transfers = self.transfers_in = self.transfers_out = self.errors = 0
+        self.clock_s = 0.0
+
+    def _spend(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.clock_s += seconds
+        if self.realtime and seconds:
+            time.sleep(seconds)
+
+    def _transfer(self) -> None:
+        if not self._open:
+            raise Disconnected("SimulatedTransport is not open")
+
+        self.transfers += 1
+        if self.disconnect_after is not None and self.transfers > self.disconnect_after:
+            self._open = False
+            self.errors += 1
+            raise Disconnected("Simulated device unplugged")
+
+        delay = self.latency(self._rng)
+        if self.jitter_s:
+            delay += self._rng.uniform(-self.jitter_s, self.jitter_s)
+        if self.stall_probability and self._rng.random() < self.stall_probability:
+            delay += self.stall_s
+        self._spend(delay)
+
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise TransportError("Simulated transfer error")
+
+    # --- Transport --------------------------------------------------------
+
+    def open(self) -> None:
+        self._spend(self.open_latency_s)
+        self._open = True
+        self._prepped = False
+
+    def close(self) -> None:
+        if self._open:
+            self._spend(self.close_latency_s)
+        self._open = False
+
+    def is_open(self) -> bool:
+        return self._open
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        self._transfer()
+        self.transfers_in += 1
+
+        if req.bm_request_type == PREP_BM:
+            self._prepped = True
+            return b"\x00" * req.length
+
+        if req.bm_request_type == READ_BM:
+            if self.requires_prep and not self._prepped:
+                self.errors += 1
+                raise Stalled("Simulated pipe error (read without prep)")
+            self._prepped = False
+            value = self.registers.get((req.b_request, req.w_index), 0)
+            return bytes([value]) + b"\x00" * (req.length - 1)
+
+        return b"\x00" * req.length
+
+    def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                          w_value: int, w_index: int, data: bytes,
+                          timeout_ms: int = 1000) -> int:
+        self._transfer()
+        self.transfers_out += 1
+
+        if bm_request_type == WRITE_BM:
+            if self.requires_prep and not self._prepped:
+                self.errors += 1
+                raise Stalled("Simulated pipe error (write without prep)")
+            self._prepped = False
+            # Write commands are the read command + 1
+            self.registers[(b_request - 1, w_index)] = w_value & 0xFF
+
+        return len(data)
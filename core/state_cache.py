@@ -0,0 +1,88 @@
+"""
+Last known device state and bus path, kept on disk between runs.
+
+Lets a UI paint the state a unit had when it was last seen (marked as
+stale) and try its old bus path first, before USB has answered anything.
+One small JSON file, rewritten atomically on every change.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.device_state import DeviceState
+from core.profile_store import atomic_write_text
+
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class CachedDevice:
+    key: str                # DetectedDevice.key / DeviceManager.key
+    descriptor_name: str    # DeviceDescriptor.name
+    path: str | None        # bus/port path it was last opened on
+    state: DeviceState
+    saved_at: float         # time.time()
+
+
+class StateCache:
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: dict | None = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                if data.get("version") != CACHE_VERSION:
+                    raise ValueError("cache version")
+            except (OSError, ValueError, AttributeError):
+                # Only a cache: a missing or unreadable file just means a cold start
+                data = {"version": CACHE_VERSION, "last": None, "devices": {}}
+            self._data = data
+        return self._data
+
+    def get(self, key: str) -> CachedDevice | None:
+        with self._lock:
+            entry = self._load()["devices"].get(key)
+            if entry is None:
+                return None
+            try:
+                return CachedDevice(
+                    key,
+                    entry["descriptor"],
+                    entry.get("path"),
+                    DeviceState.from_dict(entry["state"]),
+                    float(entry.get("saved_at", 0.0)),
+                )
+            except (KeyError, TypeError, ValueError):
+                return None
+
+    def last(self) -> CachedDevice | None:
+        """The unit that was connected most recently."""
+        with self._lock:
+            key = self._load().get("last")
+        return self.get(key) if key else None
+
+    def remember(self, key: str, descriptor_name: str, path: str | None, state: DeviceState) -> None:
+        entry = {
+            "descriptor": descriptor_name,
+            "path": path,
+            "state": state.to_dict(),
+            "saved_at": time.time(),
+        }
+        with self._lock:
+            data = self._load()
+            data["devices"][key] = entry
+            data["last"] = key
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(self.path, json.dumps(data, indent=2, ensure_ascii=False))
+            except OSError:
+                pass
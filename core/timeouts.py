@@ -0,0 +1,74 @@
+"""
+Adaptive control-transfer timeouts.
+
+A fixed 1000 ms timeout makes a wedged device cost a full second per
+pending transfer. AdaptiveTimeouts keeps a smoothed latency and deviation
+per request kind (the TCP retransmission timer estimator, RFC 6298) and
+hands out srtt + 4 * rttvar, clamped to [floor, ceiling]. A timeout
+doubles the next one, up to the ceiling, until a transfer succeeds again.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Hashable
+
+
+@dataclass(slots=True)
+class _Estimate:
+    srtt_s: float
+    rttvar_s: float
+    backoff: float = 1.0
+
+
+class AdaptiveTimeouts:
+    def __init__(
+        self,
+        *,
+        floor_ms: int = 100,
+        ceiling_ms: int = 1000,
+        alpha: float = 1 / 8,
+        beta: float = 1 / 4,
+        k: float = 4.0,
+    ) -> None:
+        if not 0 < floor_ms <= ceiling_ms:
+            raise ValueError("need 0 < floor_ms <= ceiling_ms")
+        self.floor_ms = floor_ms
+        self.ceiling_ms = ceiling_ms
+        self._alpha = alpha
+        self._beta = beta
+        self._k = k
+        self._estimates: dict[Hashable, _Estimate] = {}
+        self._lock = threading.Lock()
+
+    def timeout_ms(self, key: Hashable) -> int:
+        """Timeout for the next request of this kind; the ceiling until one has been seen."""
+        with self._lock:
+            est = self._estimates.get(key)
+            if est is None:
+                return self.ceiling_ms
+            ms = (est.srtt_s + self._k * est.rttvar_s) * 1000 * est.backoff
+        return int(min(self.ceiling_ms, max(self.floor_ms, ms)))
+
+    def observe(self, key: Hashable, elapsed_s: float) -> None:
+        """Feed the latency of a completed transfer."""
+        with self._lock:
+            est = self._estimates.get(key)
+            if est is None:
+                self._estimates[key] = _Estimate(elapsed_s, elapsed_s / 2)
+                return
+            est.rttvar_s = (1 - self._beta) * est.rttvar_s + self._beta * abs(est.srtt_s - elapsed_s)
+            est.srtt_s = (1 - self._alpha) * est.srtt_s + self._alpha * elapsed_s
+            est.backoff = 1.0
+
+    def timed_out(self, key: Hashable) -> None:
+        """Back off after a timeout, so a slow (not dead) device gets more room."""
+        with self._lock:
+            est = self._estimates.get(key)
+            if est is not None:
+                est.backoff = min(est.backoff * 2, 64.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._estimates.clear()
@@ -1,12 +1,32 @@
 # core/transport.py
 from __future__ import annotations
 
+import errno
+import fcntl
+import os
+import sys
+import tempfile
+import time
 from dataclasses import dataclass
-from typing import Protocol, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, Optional, Sequence
 
-import usb.core
-import usb.util
-import usb  # for usb.USBError
+from core.timeouts import AdaptiveTimeouts
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    import usb.core
+
+
+def _pyusb():
+    """
+    Import PyUSB on first use, so code that never opens a real device
+    (CLI help, fakes, benchmarks, the daemon client) starts without it.
+    """
+    import usb.core
+    import usb.util
+    return usb
 
 
 # --- Errors (core-level, no pyusb leaking outside) ----------------------------
@@ -27,6 +47,48 @@ class Disconnected(TransportError):
     pass
 
 
+class Stalled(TransportError):
+    """The device rejected the request (EPIPE); it is still there."""
+
+
+class TimedOut(TransportError):
+    pass
+
+
+class DeviceBusy(TransportError):
+    """Another process holds the device and didn't let go within the wait."""
+
+
+def error_from_name(name: str | None, message: str = "") -> TransportError:
+    """Rebuild a transport error sent over the wire or stored in a log."""
+    cls = {
+        "DeviceNotFound": DeviceNotFound,
+        "PermissionDenied": PermissionDenied,
+        "Disconnected": Disconnected,
+        "Stalled": Stalled,
+        "TimedOut": TimedOut,
+        "DeviceBusy": DeviceBusy,
+    }.get(name or "", TransportError)
+    return cls(message)
+
+
+# libusb reports through PyUSB's USBError.errno
+_ERRNO_ERRORS: dict[int, type[TransportError]] = {
+    errno.ENODEV: Disconnected,
+    errno.ESHUTDOWN: Disconnected,
+    errno.EPIPE: Stalled,
+    errno.ETIMEDOUT: TimedOut,
+    errno.EACCES: PermissionDenied,
+    errno.EPERM: PermissionDenied,
+}
+
+
+def error_from_usb(e: Exception) -> TransportError:
+    """Map a PyUSB error onto the matching TransportError subclass."""
+    cls = _ERRNO_ERRORS.get(getattr(e, "errno", None), TransportError)
+    return cls(str(e))
+
+
 # --- DTO for control transfer -------------------------------------------------
 
 @dataclass(frozen=True, slots=True)
@@ -39,6 +101,106 @@ class CtrlRequest:
     timeout_ms: int = 1000
 
 
+# --- Bus enumeration result ---------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class UsbDeviceInfo:
+    vendor_id: int
+    product_id: int
+    path: str                   # bus/port path, e.g. "3-2.1" (stable per physical port)
+    serial: str | None = None
+
+
+def usb_path(dev) -> str:
+    ports = getattr(dev, "port_numbers", None)
+    if ports:
+        return f"{dev.bus}-{'.'.join(str(p) for p in ports)}"
+    # Backend without port info: fall back to the (non-stable) address
+    return f"{dev.bus}-@{dev.address}"
+
+
+# --- Cross-process arbitration ------------------------------------------------
+
+def runtime_dir() -> Path:
+    """Per-user directory for sockets and lock files."""
+    return Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir())
+
+
+def default_lock_path(vendor_id: int, product_id: int, path: str) -> Path:
+    return runtime_dir() / f"tascam-util-{vendor_id:04x}-{product_id:04x}-{path.replace('/', '_')}.lock"
+
+
+class DeviceLock:
+    """
+    Exclusive per-device lock shared by every process on the machine
+    (flock on a lock file), taken before interfaces are claimed.
+
+    acquire() waits up to `timeout` seconds (None waits forever) for the
+    holder to let go, then raises DeviceBusy naming the holder. The kernel
+    drops the lock if the holder dies, so a crash never leaves it stuck.
+    """
+
+    def __init__(self, lock_path: Path, timeout: float | None = 5.0, poll_s: float = 0.05) -> None:
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.poll_s = poll_s
+        self._fd: int | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        if self._fd is not None:
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise DeviceBusy(f"Device is in use by {self._holder(fd)}") from None
+                    time.sleep(self.poll_s)
+        except BaseException:
+            os.close(fd)
+            raise
+
+        # Say who holds it, for the DeviceBusy message other processes show
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, f"{os.getpid()} {os.path.basename(sys.argv[0]) or 'python'}\n".encode(), 0)
+        self._fd = fd
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _holder(fd: int) -> str:
+        try:
+            text = os.pread(fd, 256, 0).decode(errors="replace").strip()
+        except OSError:
+            text = ""
+        if not text:
+            return "another process"
+        pid, _, name = text.partition(" ")
+        return f"{name or 'process'} (pid {pid})"
+
+    def __enter__(self) -> DeviceLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
 # --- Transport interface ------------------------------------------------------
 
 class Transport(Protocol):
@@ -54,6 +216,19 @@ class Transport(Protocol):
                           timeout_ms: int = 1000) -> int: ...
 
 
+class AsyncTransport(Protocol):
+    """asyncio counterpart of Transport; same calls, awaitable."""
+
+    async def open(self) -> None: ...
+    async def close(self) -> None: ...
+    def is_open(self) -> bool: ...
+
+    async def ctrl_transfer_in(self, req: CtrlRequest) -> bytes: ...
+    async def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                                w_value: int, w_index: int, data: bytes,
+                                timeout_ms: int = 1000) -> int: ...
+
+
 # --- Fake transport for tests/dev without device ------------------------------
 
 class FakeTransport:
@@ -99,84 +274,186 @@ class FakeTransport:
 class PyUsbTransport:
     """
     Real transport backed by PyUSB.
-    Owns the device handle and claimed interfaces.
+    Owns the device handle and claimed interfaces, and holds the unit's
+    DeviceLock while open so other processes wait for it (up to
+    `lock_timeout` seconds) instead of failing to claim.
     """
 
-    def __init__(self, vendor_id: int, product_id: int) -> None:
+    def __init__(
+        self,
+        vendor_id: int,
+        product_id: int,
+        interfaces: Sequence[int] = (0, 1, 2, 3, 4),
+        path: str | None = None,
+        timeouts: AdaptiveTimeouts | None = None,
+        lock_timeout: float | None = 5.0,
+    ) -> None:
         self._vendor_id = vendor_id
         self._product_id = product_id
+        self._interfaces = tuple(interfaces)
+        self._path = path  # pick one unit among identical devices (see usb_path)
+        # Per-request timeouts from observed latency; a request's own timeout_ms is the upper bound
+        self.timeouts = timeouts if timeouts is not None else AdaptiveTimeouts()
+        self._lock_timeout = lock_timeout
+        self._lock: DeviceLock | None = None
         self._dev: Optional[usb.core.Device] = None
         self._cfg = None
-        self._claimed = False
+        self._claimed: list[int] = []
+        self._detached: list[int] = []
+
+    @classmethod
+    def from_device(cls, dev: usb.core.Device) -> PyUsbTransport:
+        """Wrap a device handle someone else opened and claimed; close() leaves it as is."""
+        transport = cls(dev.idVendor, dev.idProduct, interfaces=())
+        transport._dev = dev
+        return transport
 
     @staticmethod
     def is_present(vendor_id: int, product_id: int) -> bool:
+        usb = _pyusb()
         return usb.core.find(
             idVendor = vendor_id,
             idProduct = product_id
         ) is not None
 
+    @staticmethod
+    def list_present() -> list[tuple[int, int]]:
+        """(vendor_id, product_id) of every device on the bus, from a single enumeration."""
+        usb = _pyusb()
+        return [(d.idVendor, d.idProduct) for d in usb.core.find(find_all=True)]
+
+    @staticmethod
+    def list_devices(vendor_id: int | None = None) -> list[UsbDeviceInfo]:
+        """
+        Every device on the bus (optionally of one vendor) with its bus/port
+        path and serial number, where the device reports one.
+        """
+        usb = _pyusb()
+        match = {} if vendor_id is None else {"idVendor": vendor_id}
+        return [PyUsbTransport._device_info(d) for d in usb.core.find(find_all=True, **match)]
+
+    @staticmethod
+    def device_at(vendor_id: int, product_id: int, path: str) -> UsbDeviceInfo | None:
+        """
+        The device with these ids on one bus/port path, if it is there.
+        Reads only that device's serial, unlike list_devices.
+        """
+        usb = _pyusb()
+        dev = usb.core.find(
+            idVendor=vendor_id,
+            idProduct=product_id,
+            custom_match=lambda d: usb_path(d) == path,
+        )
+        return PyUsbTransport._device_info(dev) if dev is not None else None
+
+    @staticmethod
+    def _device_info(dev) -> UsbDeviceInfo:
+        usb = _pyusb()
+        serial = None
+        if getattr(dev, "iSerialNumber", 0):
+            try:
+                serial = usb.util.get_string(dev, dev.iSerialNumber) or None
+            except (usb.USBError, ValueError, NotImplementedError):
+                serial = None
+        return UsbDeviceInfo(dev.idVendor, dev.idProduct, usb_path(dev), serial)
+
 
     def open(self) -> None:
-        dev = usb.core.find(idVendor=self._vendor_id, idProduct=self._product_id)
+        usb = _pyusb()
+        if self._path is None:
+            dev = usb.core.find(idVendor=self._vendor_id, idProduct=self._product_id)
+        else:
+            dev = usb.core.find(
+                idVendor=self._vendor_id,
+                idProduct=self._product_id,
+                custom_match=lambda d: usb_path(d) == self._path,
+            )
         if dev is None:
             raise DeviceNotFound("USB device not found")
 
+        # Found units are told apart by port, so two units can be held at once
+        lock = DeviceLock(
+            default_lock_path(self._vendor_id, self._product_id, usb_path(dev)), self._lock_timeout,
+        )
+        lock.acquire()
+
+        cfg = None
+        detached: list[int] = []
+        claimed: list[int] = []
         try:
-            # Ensure a configuration is selected
-            dev.set_configuration()
-            cfg = dev.get_active_configuration()
+            # Keep the active configuration: re-selecting it resets every
+            # interface, including running audio streams.
+            try:
+                cfg = dev.get_active_configuration()
+            except usb.USBError:
+                dev.set_configuration()
+                cfg = dev.get_active_configuration()
 
-            # Detach kernel drivers (vendored does 0..4)
-            for iface in range(0, 5):
+            # Detach kernel drivers only from the interfaces we need
+            for iface in self._interfaces:
                 try:
                     if dev.is_kernel_driver_active(iface):
                         dev.detach_kernel_driver(iface)
+                        detached.append(iface)
                 except (NotImplementedError, usb.USBError):
                     # Some backends/permissions may not support this check cleanly.
                     pass
 
-            # Claim interfaces 0..4, altsetting 0
-            for iface in range(0, 5):
+            # Claim them, altsetting 0
+            for iface in self._interfaces:
                 intf = cfg[(iface, 0)]
                 usb.util.claim_interface(dev, intf)
+                claimed.append(iface)
 
-        except usb.USBError as e:
+        except BaseException as e:
+            # Whatever went wrong, hand back what was taken and let go of the lock
+            try:
+                self._release(dev, cfg, claimed, detached)
+            finally:
+                lock.release()
+            if not isinstance(e, usb.USBError):
+                raise
             msg = str(e).lower()
             if "access" in msg or "permission" in msg:
                 raise PermissionDenied(str(e)) from e
-            raise TransportError(str(e)) from e
+            raise error_from_usb(e) from e
 
         self._dev = dev
         self._cfg = cfg
-        self._claimed = True
+        self._claimed = claimed
+        self._detached = detached
+        self._lock = lock
 
-    def close(self) -> None:
-        if not self._dev or not self._cfg:
-            self._dev = None
-            self._cfg = None
-            self._claimed = False
-            return
+    @staticmethod
+    def _release(dev, cfg, claimed: list[int], detached: list[int]) -> None:
+        usb = _pyusb()
+        if cfg is not None:
+            for iface in claimed:
+                try:
+                    usb.util.release_interface(dev, cfg[(iface, 0)])
+                except usb.USBError:
+                    pass
 
-        try:
-            if self._claimed:
-                for iface in range(0, 5):
-                    try:
-                        intf = self._cfg[(iface, 0)]
-                        usb.util.release_interface(self._dev, intf)
-                    except usb.USBError:
-                        pass
-
-            # vendored attaches only driver 0; we’ll do the same (safe minimal)
+        # Hand back what we took; the first attach usually lets the kernel
+        # driver pick up the rest, so later failures are expected and ignored.
+        for iface in detached:
             try:
-                self._dev.attach_kernel_driver(0)
+                dev.attach_kernel_driver(iface)
             except usb.USBError:
                 pass
 
+    def close(self) -> None:
+        try:
+            if self._dev is not None:
+                self._release(self._dev, self._cfg, self._claimed, self._detached)
         finally:
             self._dev = None
             self._cfg = None
-            self._claimed = False
+            self._claimed = []
+            self._detached = []
+            if self._lock is not None:
+                self._lock.release()
+                self._lock = None
 
     def is_open(self) -> bool:
         return self._dev is not None
@@ -186,21 +463,34 @@ class PyUsbTransport:
             raise Disconnected("USB device is not open")
         return self._dev
 
-    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+    def _ctrl_transfer(self, bm_request_type: int, b_request: int, w_value: int, w_index: int,
+                       data_or_length, timeout_ms: int):
+        usb = _pyusb()
         dev = self._require_open()
+        key = (bm_request_type, b_request)
+        timeout_ms = min(timeout_ms, self.timeouts.timeout_ms(key))
+        start = time.perf_counter()
         try:
-            data = dev.ctrl_transfer(
-                req.bm_request_type,
-                req.b_request,
-                req.w_value,
-                req.w_index,
-                req.length,
-                req.timeout_ms,
-            )
-            # PyUSB returns an array('B')-like; convert to bytes
-            return bytes(data)
+            result = dev.ctrl_transfer(bm_request_type, b_request, w_value, w_index, data_or_length, timeout_ms)
         except usb.USBError as e:
-            raise TransportError(str(e)) from e
+            err = error_from_usb(e)
+            if isinstance(err, TimedOut):
+                self.timeouts.timed_out(key)
+            raise err from e
+        self.timeouts.observe(key, time.perf_counter() - start)
+        return result
+
+    def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        data = self._ctrl_transfer(
+            req.bm_request_type,
+            req.b_request,
+            req.w_value,
+            req.w_index,
+            req.length,
+            req.timeout_ms,
+        )
+        # PyUSB returns an array('B')-like; convert to bytes
+        return bytes(data)
 
     def ctrl_transfer_out(
         self,
@@ -211,15 +501,95 @@ class PyUsbTransport:
         data: bytes,
         timeout_ms: int = 1000,
     ) -> int:
-        dev = self._require_open()
+        return self._ctrl_transfer(bm_request_type, b_request, w_value, w_index, data, timeout_ms)
+
+
+
+# --- PyUSB-style device facade ------------------------------------------------
+
+class TransportDevice:
+    """
+    Exposes a Transport through PyUSB's `device.ctrl_transfer(...)` call,
+    so code written against a raw usb.core.Device (cli_core commands)
+    can run over any Transport.
+    """
+
+    def __init__(self, transport: Transport) -> None:
+        self.transport = transport
+
+    def ctrl_transfer(self, bm_request_type: int, b_request: int,
+                      w_value: int = 0, w_index: int = 0,
+                      data_or_w_length=None, timeout: int | None = None):
+        timeout_ms = 1000 if timeout is None else timeout
+
+        if bm_request_type & 0x80:
+            return self.transport.ctrl_transfer_in(CtrlRequest(
+                bm_request_type, b_request, w_value, w_index, int(data_or_w_length or 0), timeout_ms,
+            ))
+
+        return self.transport.ctrl_transfer_out(
+            bm_request_type, b_request, w_value, w_index, bytes(data_or_w_length or b""), timeout_ms,
+        )
+
+
+# --- asyncio adapters ---------------------------------------------------------
+
+class ThreadedAsyncTransport:
+    """
+    AsyncTransport over any blocking Transport.
+    Every call runs on one dedicated executor thread owned by this device,
+    so transfers stay serialized while the event loop keeps running.
+    """
+
+    def __init__(self, transport: Transport) -> None:
+        self._transport = transport
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def transport(self) -> Transport:
+        return self._transport
+
+    async def _call(self, fn, *args):
+        # Imported here: only code already running an event loop gets this far,
+        # and synchronous callers of this module shouldn't pay for asyncio.
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="usb-io")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def open(self) -> None:
+        await self._call(self._transport.open)
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
         try:
-            return dev.ctrl_transfer(
-                bm_request_type,
-                b_request,
-                w_value,
-                w_index,
-                data,
-                timeout_ms,
-            )
-        except usb.USBError as e:
-            raise TransportError(str(e)) from e
+            await self._call(self._transport.close)
+        finally:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def is_open(self) -> bool:
+        return self._transport.is_open()
+
+    async def ctrl_transfer_in(self, req: CtrlRequest) -> bytes:
+        return await self._call(self._transport.ctrl_transfer_in, req)
+
+    async def ctrl_transfer_out(self, bm_request_type: int, b_request: int,
+                                w_value: int, w_index: int, data: bytes,
+                                timeout_ms: int = 1000) -> int:
+        return await self._call(
+            self._transport.ctrl_transfer_out,
+            bm_request_type, b_request, w_value, w_index, data, timeout_ms,
+        )
+
+
+class AsyncPyUsbTransport(ThreadedAsyncTransport):
+    """PyUsbTransport driven from asyncio (one I/O thread per device)."""
+
+    def __init__(self, vendor_id: int, product_id: int,
+                 interfaces: Sequence[int] = (0, 1, 2, 3, 4)) -> None:
+        super().__init__(PyUsbTransport(vendor_id, product_id, interfaces))
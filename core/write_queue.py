@@ -0,0 +1,148 @@
+""" Debounced, coalescing parameter writes for rapid input (sliders, controllers). """
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from core.device_manager import DeviceManager
+
+
+# listener(values, dropped, error): what a flush tried to write, the part of
+# it that didn't get written (empty on success), and why (None: see last_error)
+FlushListener = Callable[[dict[str, int], dict[str, int], "str | None"], None]
+
+
+class WriteQueue:
+    """
+    Sits in front of DeviceManager.apply() and coalesces writes per
+    parameter key: within a burst only the last value of each key is
+    written (last write wins), so scrubbing through ten routing options
+    costs one write, not ten prep+prep+write triples.
+
+    A flush happens once no new value has arrived for `debounce` seconds,
+    or `max_delay` seconds after the oldest queued value, so continuous
+    input still reaches the device. Keys are written in the order their
+    final values were submitted; close() writes whatever is still queued.
+    Once a batch fails, it and the batches after it are dropped rather
+    than retried, and the listener gets exactly those values.
+    """
+
+    def __init__(
+        self,
+        manager: DeviceManager,
+        *,
+        debounce: float = 0.05,
+        max_delay: float = 0.25,
+        verify: bool = True,
+        listener: FlushListener | None = None,
+    ) -> None:
+        self._manager = manager
+        self.debounce = debounce
+        self.max_delay = max(debounce, max_delay)
+        self.verify = verify
+        self._listener = listener
+
+        # key -> raw value, in submission order of the latest value
+        self._pending: dict[str, int] = {}
+        self._first_at = 0.0
+        self._last_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        # Serializes flushes, so batches reach the device in order
+        self._flush_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> dict[str, int]:
+        with self._cond:
+            return dict(self._pending)
+
+    def submit(self, key: str, value: int) -> None:
+        key = self._manager.schema.parameter(key).key
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WriteQueue is closed")
+            now = time.monotonic()
+            if not self._pending:
+                self._first_at = now
+            self._last_at = now
+            # Re-inserting moves the key behind everything submitted before it
+            self._pending.pop(key, None)
+            self._pending[key] = int(value)
+            self._cond.notify()
+
+    def flush(self) -> int | None:
+        """Write everything queued now, on the calling thread. Same result as apply()."""
+        with self._flush_lock:
+            with self._cond:
+                values, self._pending = self._pending, {}
+            if not values:
+                return 0
+
+            written: int | None = 0
+            dropped: dict[str, int] = {}
+            error: str | None = None
+            for run in _schema_ordered_runs(values, self._manager):
+                if written is not None:
+                    try:
+                        result = self._manager.apply(run, verify=self.verify)
+                    except Exception as e:
+                        result, error = None, f"{type(e).__name__}: {e}"
+                    if result is not None:
+                        written += result
+                        continue
+                    written = None
+                dropped.update(run)
+
+            if self._listener is not None:
+                self._listener(values, dropped, error)
+            return written
+
+    def close(self, timeout: float | None = 2.0) -> None:
+        """Stop accepting values and write out the ones still queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                due = min(self._last_at + self.debounce, self._first_at + self.max_delay)
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            try:
+                self.flush()
+            except Exception:
+                # A failing listener must not stop the writes queued after it
+                pass
+
+
+def _schema_ordered_runs(values: dict[str, int], manager: DeviceManager) -> list[dict[str, int]]:
+    """
+    Split values into consecutive batches whose keys are in schema order.
+    apply() writes a batch in schema order, so each batch keeps the
+    submission order while still sharing one prep handshake.
+    """
+    position = {p.key: i for i, p in enumerate(manager.schema.parameters)}
+    runs: list[dict[str, int]] = []
+    last = None
+    for key, value in values.items():
+        if last is None or position[key] <= last:
+            runs.append({})
+        runs[-1][key] = value
+        last = position[key]
+    return runs
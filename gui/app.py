@@ -2,19 +2,24 @@ import sys
 
 from pathlib import Path
 
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
 from gui.main_window import MainWindow
 
 
-def main() -> int:
-    app = QApplication(sys.argv)
-
+def apply_stylesheet(app: QApplication) -> None:
     qss = Path(__file__).parent / "style.qss"
     if qss.exists():
         app.setStyleSheet(qss.read_text(encoding="utf-8"))
 
+
+def main() -> int:
+    app = QApplication(sys.argv)
+
     window = MainWindow()
+    # Parse and apply the stylesheet once the first frame is up, not before it
+    window.first_painted.connect(lambda: QTimer.singleShot(0, lambda: apply_stylesheet(app)))
     window.show()
     return app.exec()
 
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import queue
+from typing import Any, Callable
+
+from PySide6.QtCore import QThread, Signal
+
+# Called on the GUI thread with (result, error); error is None on success
+DoneCallback = Callable[[Any, "str | None"], None]
+
+
+class DeviceWorker(QThread):
+    """
+    Runs USB work (enumeration, connect, apply, disconnect) off the GUI thread.
+
+    Requests are callables queued with submit() and run one at a time, in
+    order, so the DeviceManager only ever sees one caller besides its poller.
+    Each result comes back through a queued signal and is handed to the
+    request's callback on the GUI thread.
+    """
+
+    finished_request = Signal(object, object, object)  # callback, result, error
+    busy_changed = Signal(int)                          # requests queued or running
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._requests: queue.Queue[tuple[Callable[[], Any], DoneCallback | None] | None] = queue.Queue()
+        self._pending = 0  # touched on the GUI thread only
+        self.finished_request.connect(self._on_finished_request)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, fn: Callable[[], Any], on_done: DoneCallback | None = None) -> None:
+        self._pending += 1
+        self.busy_changed.emit(self._pending)
+        self._requests.put((fn, on_done))
+
+    def stop(self, timeout_ms: int = 5000) -> None:
+        """Let queued requests finish, then end the thread."""
+        self._requests.put(None)
+        self.wait(timeout_ms)
+
+    def run(self) -> None:
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            fn, on_done = request
+            try:
+                result, error = fn(), None
+            except Exception as e:
+                result, error = None, str(e) or type(e).__name__
+            self.finished_request.emit(on_done, result, error)
+
+    def _on_finished_request(self, on_done: DoneCallback | None, result: Any, error: str | None) -> None:
+        self._pending -= 1
+        self.busy_changed.emit(self._pending)
+        if on_done is not None:
+            on_done(result, error)
@@ -10,10 +10,6 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from gui.tabs.routing_tab import RoutingTab, RouteSelection
-from gui.tabs.monitoring_tab import MonitoringTab
-from gui.tabs.inputs_tab import InputsTab
-
 from gui.widgets.tabs_panel import TabsPanel
 
 
@@ -32,22 +28,11 @@ class LeftColumnWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(10)
 
+        # Pages are built (and their modules imported) when first opened
         self.tabs = TabsPanel(self)
-
-        # Routing
-        routing = RoutingTab(self)
-        routing.route_changed.connect(self.route_changed.emit)
-        self.tabs.add_tab(routing, "Routing")
-
-        # Monitoring
-        monitoring = MonitoringTab(self)
-        monitoring.monitor_changed.connect(self.monitor_changed.emit)
-        self.tabs.add_tab(monitoring, "Monitoring")
-
-        # Inputs
-        inputs = InputsTab(self)
-        inputs.input_changed.connect(self.input_changed.emit)
-        self.tabs.add_tab(inputs, "Inputs")
+        self.tabs.add_lazy_tab(self._create_routing_tab, "Routing")
+        self.tabs.add_lazy_tab(self._create_monitoring_tab, "Monitoring")
+        self.tabs.add_lazy_tab(self._create_inputs_tab, "Inputs")
 
         separator = QFrame(self)
         separator.setProperty("role", "sectionSeparator")
@@ -78,6 +63,27 @@ class LeftColumnWidget(QWidget):
         layout.addWidget(separator, 0)
         layout.addWidget(self.powersave_panel, 0)
 
+    def _create_routing_tab(self) -> QWidget:
+        from gui.tabs.routing_tab import RoutingTab
+
+        routing = RoutingTab(self)
+        routing.route_changed.connect(self.route_changed.emit)
+        return routing
+
+    def _create_monitoring_tab(self) -> QWidget:
+        from gui.tabs.monitoring_tab import MonitoringTab
+
+        monitoring = MonitoringTab(self)
+        monitoring.monitor_changed.connect(self.monitor_changed.emit)
+        return monitoring
+
+    def _create_inputs_tab(self) -> QWidget:
+        from gui.tabs.inputs_tab import InputsTab
+
+        inputs = InputsTab(self)
+        inputs.input_changed.connect(self.input_changed.emit)
+        return inputs
+
     def set_editable(self, enabled: bool) -> None:
         self.tabs.setEnabled(enabled)
         self.powersave_panel.setEnabled(enabled)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QWidget
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QProgressBar, QPushButton, QWidget
 
 
 class StatusBarWidget(QFrame):
@@ -22,6 +22,14 @@ class StatusBarWidget(QFrame):
 
         self.status_label = QLabel("Status", self)
 
+        # In-flight USB work; an indeterminate bar keeps animating while the GUI thread is free
+        self.busy_bar = QProgressBar(self)
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setFixedWidth(80)
+        self.busy_bar.setToolTip("Talking to the device")
+        self.busy_bar.hide()
+
         self.save_profile_btn = QPushButton("Save profile", self)
         self.load_profile_btn = QPushButton("Load profile", self)
         self.reconnect_btn = QPushButton("Reconnect", self)
@@ -31,6 +39,7 @@ class StatusBarWidget(QFrame):
         self.reconnect_btn.clicked.connect(self.reconnect_clicked.emit)
 
         layout.addWidget(self.status_label, 1)
+        layout.addWidget(self.busy_bar, 0)
         layout.addWidget(self.save_profile_btn, 0)
         layout.addWidget(self.load_profile_btn, 0)
         layout.addWidget(self.reconnect_btn, 0)
@@ -43,4 +52,7 @@ class StatusBarWidget(QFrame):
 
     def set_profiles_enabled(self, enabled: bool) -> None:
         self.save_profile_btn.setEnabled(enabled)
-        self.load_profile_btn.setEnabled(enabled)
\ No newline at end of file
+        self.load_profile_btn.setEnabled(enabled)
+
+    def set_busy(self, busy: bool) -> None:
+        self.busy_bar.setVisible(busy)
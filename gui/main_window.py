@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import json
-import sys
+import threading
 from pathlib import Path
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QEvent, QTimer, Signal
+from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
-    QApplication,
     QHBoxLayout,
     QInputDialog,
     QMainWindow,
@@ -16,16 +15,24 @@ from PySide6.QtWidgets import (
 )
 
 from core.devices import SUPPORTED_DEVICES
-from core.detector import detect_supported_devices
+from core.detector import DetectedDevice, detect_at_path, detect_devices
 from core.device_manager import DeviceManager
-
+from core.hotplug import HotplugWatcher, UeventSource
+from core.instrumentation import TransferStats
+from core.parameters import decode, encode, set_value, state_values
+from core.profile_store import ProfileStore, ProfileStoreError
+from core.profiles import Profile, profile_from_dict, profile_to_dict, recall_changes
+from core.state_cache import CachedDevice, StateCache
+
+from gui.device_worker import DeviceWorker
 from gui.layout.left_column import LeftColumnWidget
 from gui.layout.right_column import RightColumnWidget
 from gui.layout.status_bar import StatusBarWidget
 
+from gui.widgets.debug_panel import TransferStatsDialog
 from gui.widgets.planned_changes import PlannedChanges
 from gui.widgets.planned_keys import PLANNED_ORDER
-from gui.widgets.ui_text import MONITORING_INPUT_LABELS, ROUTING_SOURCE_LABELS
+from gui.widgets.ui_text import MONITORING_INPUT_LABELS, ROUTING_SOURCE_LABELS, format_device_state, planned_line
 
 from gui.tabs.routing_tab import RouteSelection
 
@@ -35,6 +42,16 @@ class MainWindow(QMainWindow):
 
     PROFILE_DIRNAME = "profiles"
     PROFILE_FILENAME = "device_profiles.json"
+    STATE_CACHE_FILENAME = "last_state.json"
+
+    # Poller thread → GUI thread (queued across threads by Qt)
+    device_state_changed = Signal(object, object)  # changes, DeviceState
+    hotplug_event = Signal(str, object, object)     # action, DeviceDescriptor, HotplugEvent
+    reconnect_event = Signal(str, str)              # "lost" / "restored" / "gave_up", detail
+    first_painted = Signal()                        # once, after the window's first paint
+
+    # Delay before probing a freshly plugged device (udev applies permissions first)
+    HOTPLUG_SETTLE_MS = 500
 
     def __init__(self) -> None:
         super().__init__()
@@ -43,7 +60,20 @@ class MainWindow(QMainWindow):
         self.resize(980, 720)
 
         self.device_manager: DeviceManager | None = None
+        # Serves CLI calls over the connected manager's handle (see _start_broker)
+        self._broker = None
+        self._detecting = False
+        self._painted = False
         self._planned = PlannedChanges(order=PLANNED_ORDER)
+        self._profiles = ProfileStore(self._profiles_path())
+        # Last known state and bus path, painted before USB answers
+        self._state_cache = StateCache(self._profiles_path().with_name(self.STATE_CACHE_FILENAME))
+        self._cached: CachedDevice | None = self._state_cache.last()
+
+        # USB transfer statistics for the debug panel (Ctrl+Shift+D); off until
+        # the panel is first opened, so normal use pays nothing for them
+        self._transfer_stats: TransferStats | None = None
+        self._stats_dialog: TransferStatsDialog | None = None
 
         root = QWidget(self)
         self.setCentralWidget(root)
@@ -75,17 +105,38 @@ class MainWindow(QMainWindow):
 
         self.right.plan_clicked.connect(self._set_planned_mode)
         self.right.cancel_clicked.connect(self._set_editing_mode)
-        # confirm_clicked stays for later (apply-to-device)
-        # self.right.confirm_clicked.connect(self._on_confirm_clicked)
+        self.right.confirm_clicked.connect(self._on_confirm_clicked)
 
         self.status.reconnect_clicked.connect(self._on_reconnect_clicked)
         self.status.save_profile_clicked.connect(self._on_save_profile_clicked)
         self.status.load_profile_clicked.connect(self._on_load_profile_clicked)
 
+        # All USB work except polling runs here, one request at a time
+        self._worker = DeviceWorker(self)
+        self._worker.busy_changed.connect(lambda pending: self.status.set_busy(pending > 0))
+        self._worker.start()
+
+        self.device_state_changed.connect(self._on_device_state_changed)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self._show_stats_dialog)
+        self.hotplug_event.connect(self._on_hotplug_event)
+        self.reconnect_event.connect(self._on_reconnect_event)
+
+        self._hotplug: HotplugWatcher | None = None
+        if UeventSource.available():
+            try:
+                self._hotplug = HotplugWatcher(UeventSource(), self.hotplug_event.emit)
+                self._hotplug.start()
+            except OSError:
+                self._hotplug = None
+
         # Initial UI state
         self._render_planned()
         self._set_idle_mode()
-        self._set_status("No device connected.", can_reconnect=True)
+        if self._cached is not None:
+            self._render_cached_state(self._cached)
+            self._set_status(f"Last seen: {self._cached.descriptor_name}. Connecting...", can_reconnect=False)
+        else:
+            self._set_status("No device connected.", can_reconnect=True)
 
         QTimer.singleShot(0, self._apply_min_window_width)
         QTimer.singleShot(0, self._startup_autodetect)
@@ -100,23 +151,17 @@ class MainWindow(QMainWindow):
         d.mkdir(parents=True, exist_ok=True)
         return d / self.PROFILE_FILENAME
 
-    def _load_profiles(self) -> dict:
-        path = self._profiles_path()
-        if not path.exists():
-            return {"devices": {}}
-        try:
-            return json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            return {"devices": {}}
-
-    def _save_profiles(self, data: dict) -> None:
-        self._profiles_path().write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-
     def _device_key(self) -> str:
+        """Profiles belong to one physical unit (serial, else bus/port path)."""
         if self.device_manager is not None:
-            desc = getattr(self.device_manager, "descriptor", None)
-            if desc is not None:
-                return f"{desc.vendor_id:04x}:{desc.product_id:04x}"
+            return self.device_manager.key
+        return "offline"
+
+    def _model_key(self) -> str:
+        """Pre-unit profile key (VID:PID), still honoured when loading."""
+        if self.device_manager is not None:
+            desc = self.device_manager.descriptor
+            return f"{desc.vendor_id:04x}:{desc.product_id:04x}"
         return "offline"
 
     def _device_display_name(self) -> str:
@@ -131,6 +176,11 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Save profile", "Connect a device first, then save a profile for it.")
             return
 
+        dm = self.device_manager
+        if dm.state is None:
+            QMessageBox.information(self, "Save profile", "The device state hasn't been read yet; try again in a moment.")
+            return
+
         name, ok = QInputDialog.getText(self, "Save profile", f"Profile name for {self._device_display_name()}:")
         if not ok:
             return
@@ -138,12 +188,16 @@ class MainWindow(QMainWindow):
         if not name:
             return
 
-        data = self._load_profiles()
-        devices = data.setdefault("devices", {})
-        key = self._device_key()
-        dev = devices.setdefault(key, {"profiles": {}})
-        dev["profiles"][name] = {"planned_lines": dict(self._planned.lines)}
-        self._save_profiles(data)
+        # Snapshot of the device as it will be once the planned changes are confirmed
+        state = dm.state.copy()
+        for key, value in self._planned.values.items():
+            set_value(state, key, encode(key, value, dm.schema), dm.schema)
+
+        try:
+            self._profiles.put(self._device_key(), name, profile_to_dict(Profile(state)))
+        except (OSError, ProfileStoreError) as e:
+            QMessageBox.warning(self, "Save profile", f"Could not save the profile:\n{e}")
+            return
 
         self._set_status(f"Saved profile '{name}' for {self._device_display_name()}.", can_reconnect=True)
 
@@ -152,10 +206,11 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Load profile", "Connect a device first, then load a profile for it.")
             return
 
-        data = self._load_profiles()
-        devices = data.get("devices", {})
-        dev = devices.get(self._device_key())
-        profiles = (dev or {}).get("profiles", {})
+        try:
+            profiles = self._profiles.profiles(self._device_key()) or self._profiles.profiles(self._model_key())
+        except (OSError, ProfileStoreError) as e:
+            QMessageBox.warning(self, "Load profile", f"Could not read saved profiles:\n{e}")
+            return
         if not profiles:
             QMessageBox.information(self, "Load profile", f"No saved profiles found for {self._device_display_name()}.")
             return
@@ -167,69 +222,221 @@ class MainWindow(QMainWindow):
         if not ok:
             return
 
-        payload = profiles.get(choice, {})
-        planned_lines = payload.get("planned_lines", {})
+        dm = self.device_manager
+        try:
+            profile = profile_from_dict(profiles[choice], dm.schema)
+        except (ValueError, KeyError, TypeError) as e:
+            QMessageBox.warning(self, "Load profile", f"Profile '{choice}' can't be read:\n{e}")
+            return
 
+        # Plan only what differs from the device, so confirming writes the minimum
+        changes = recall_changes(profile, dm.state, dm.schema)
         self._planned.clear()
-        for k, v in planned_lines.items():
-            self._planned.set_line(k, v)
+        for key, value in changes.items():
+            name = decode(key, value, dm.schema)
+            self._planned.set_line(key, planned_line(key, name), name)
         self._render_planned()
 
-        self._set_status(f"Loaded profile '{choice}' for {self._device_display_name()}.", can_reconnect=True)
+        self._set_status(
+            f"Loaded profile '{choice}' for {self._device_display_name()}: {len(changes)} change(s).",
+            can_reconnect=True,
+        )
 
     # -------------------------
     # Device autodetect
     # -------------------------
 
     def _startup_autodetect(self) -> None:
-        devices = detect_supported_devices(SUPPORTED_DEVICES)
+        if self._detecting:
+            return
+        self._detecting = True
+
+        # First try where the last unit was, which skips reading every serial on the bus
+        cached, self._cached = self._cached, None
+        descriptor = next((d for d in SUPPORTED_DEVICES if cached and d.name == cached.descriptor_name), None)
+        if descriptor is not None and cached.path:
+            self._worker.submit(lambda: detect_at_path(descriptor, cached.path), self._on_cached_path_probed)
+            return
+
+        self._detect_all()
+
+    def _detect_all(self) -> None:
+        self._set_status("Looking for devices...", can_reconnect=False)
+        self._worker.submit(lambda: detect_devices(SUPPORTED_DEVICES), self._on_devices_detected)
+
+    def _on_cached_path_probed(self, detected: DetectedDevice | None, error: str | None) -> None:
+        if detected is not None:
+            self._connect_detected(detected)
+        else:
+            self._detect_all()
+
+    def _on_devices_detected(self, devices: list[DetectedDevice] | None, error: str | None) -> None:
+        if error is not None:
+            self._detecting = False
+            self.device_manager = None
+            self._set_idle_mode()
+            self._set_status(f"Device detection failed: {error}", can_reconnect=True)
+            return
 
         if len(devices) == 0:
+            self._detecting = False
             self.device_manager = None
             self._set_idle_mode()
             self._set_status("No supported device detected.", can_reconnect=True)
             return
 
         if len(devices) == 1:
-            selected = devices[0]
-            dm = DeviceManager(selected)
-            if dm.connect():
-                self.device_manager = dm
-                self._set_editing_mode()
-                self._set_status(f"Connected: {selected.name}", can_reconnect=True)
-                return
-
-            self.device_manager = None
-            self._set_idle_mode()
-            self._set_status("Connection failed.", can_reconnect=True)
+            self._connect_detected(devices[0])
             return
 
-        labels = [d.name for d in devices]
+        # Identical models are told apart by their USB port
+        labels = [f"{d.descriptor.name} ({d.path})" for d in devices]
         choice, ok = QInputDialog.getItem(
             self, "Select device", "Multiple supported devices detected. Choose one.", labels, 0, False
         )
         if not ok:
+            self._detecting = False
             self.device_manager = None
             self._set_idle_mode()
             self._set_status("Device selection canceled.", can_reconnect=True)
             return
 
-        selected = devices[labels.index(choice)]
-        dm = DeviceManager(selected)
-        if dm.connect():
-            self.device_manager = dm
+        self._connect_detected(devices[labels.index(choice)])
+
+    def _connect_detected(self, selected: DetectedDevice) -> None:
+        dm = DeviceManager(
+            selected.descriptor, path=selected.path, key=selected.key, stats=self._transfer_stats,
+        )
+        self._set_status(f"Connecting to {selected.descriptor.name}...", can_reconnect=False)
+        self._worker.submit(dm.connect, lambda ok, error: self._on_connect_done(dm, bool(ok), error))
+
+    def _on_connect_done(self, dm: DeviceManager, ok: bool, error: str | None) -> None:
+        self._detecting = False
+        if ok:
+            self._attach_device(dm)
             self._set_editing_mode()
-            self._set_status(f"Connected: {selected.name}", can_reconnect=True)
+            self._set_status(f"Connected: {dm.descriptor.name}", can_reconnect=True)
+            return
+
+        self.device_manager = None
+        self._set_idle_mode()
+        err = error or dm.last_error or "Unknown error"
+        self._set_status(f"Connection failed: {err}", can_reconnect=True)
+
+    def _attach_device(self, dm: DeviceManager) -> None:
+        self.device_manager = dm
+        dm.subscribe(self.device_state_changed.emit)
+        # Runs on the poller thread, so the file write stays off the GUI thread
+        dm.subscribe(lambda changes, state: self._state_cache.remember(dm.key, dm.descriptor.name, dm.path, state))
+        dm.start_polling()
+        dm.start_auto_reconnect(listener=self.reconnect_event.emit)
+        self._start_broker(dm)
+
+    def _render_cached_state(self, cached: CachedDevice) -> None:
+        text = format_device_state(state_values(cached.state))
+        self.right.set_current_state_text(f"Last known state (not confirmed yet):\n{text}")
+
+    def _on_device_state_changed(self, changes: dict, state) -> None:
+        if self.device_manager is None:
+            return
+        schema = self.device_manager.schema
+        self.right.set_current_state_text(format_device_state(state_values(state, schema), schema))
+
+    def _on_reconnect_event(self, event: str, detail: str) -> None:
+        if self.device_manager is None:
+            return
+        name = self._device_display_name()
+        if event == "lost":
+            self._set_idle_mode()
+            self._set_status(f"{name}: {detail}. Reconnecting...", can_reconnect=True)
+        elif event == "restored":
+            self._set_editing_mode()
+            self._set_status(f"{name}: {detail}.", can_reconnect=True)
         else:
+            self._set_status(f"{name}: reconnect failed: {detail}", can_reconnect=True)
+
+    def _on_hotplug_event(self, action: str, descriptor, event) -> None:
+        dm = self.device_manager
+
+        if action == "add":
+            # A manager that is reconnecting on its own picks the device up itself
+            if dm is None or not (dm.connected or dm.auto_reconnect):
+                QTimer.singleShot(self.HOTPLUG_SETTLE_MS, self._startup_autodetect)
+            return
+
+        if action == "remove" and dm is not None and self._is_managed_unit(dm, descriptor, event):
+            self._stop_broker()
+            self._worker.submit(dm.disconnect)
             self.device_manager = None
+            self.right.set_current_state_text("Not loaded yet.")
             self._set_idle_mode()
-            err = dm.last_error or "Unknown error"
-            self._set_status(f"Connection failed: {err}", can_reconnect=True)
+            self._set_status(f"{descriptor.name} was unplugged.", can_reconnect=True)
+
+    @staticmethod
+    def _is_managed_unit(dm: DeviceManager, descriptor, event) -> bool:
+        """Whether a hotplug event is about the unit dm manages, not just the same model."""
+        if dm.descriptor != descriptor:
+            return False
+        # Without both paths the model is all there is to go on
+        if dm.path is None or event.usb_path is None:
+            return True
+        return dm.path == event.usb_path
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        # The stylesheet is applied after the first frame (gui.app) and adds
+        # tab padding; size the window for the styled titles again
+        if event.type() == QEvent.Type.StyleChange:
+            QTimer.singleShot(0, self._apply_min_window_width)
+
+    def closeEvent(self, event) -> None:
+        if self._hotplug is not None:
+            self._hotplug.stop()
+        self._stop_broker()
+        if self.device_manager is not None:
+            self._worker.submit(self.device_manager.disconnect)
+        self._worker.stop()
+        super().closeEvent(event)
+
+    # -------------------------
+    # Device broker
+    # -------------------------
+
+    def _start_broker(self, dm: DeviceManager) -> None:
+        """
+        While connected the GUI holds the device lock, so CLI calls would
+        only wait for it. Serve them on the daemon socket instead: they run
+        over this manager's handle, between the poller's transfers.
+        """
+        from core.handle_server import HandleServer, default_socket_path
+
+        self._stop_broker()
+        socket_path = default_socket_path(dm.descriptor.vendor_id, dm.descriptor.product_id)
+        try:
+            broker = HandleServer(dm.shared_transport, socket_path)
+        except OSError:
+            # SocketInUse: a daemon already answers there; leave its socket alone
             return
+        threading.Thread(target=broker.serve_forever, name="device-broker", daemon=True).start()
+        self._broker = broker
 
-        self.device_manager = None
-        self._set_idle_mode()
-        self._set_status("Connection failed.", can_reconnect=True)
+    def _stop_broker(self) -> None:
+        broker, self._broker = self._broker, None
+        if broker is None:
+            return
+
+        def stop() -> None:
+            broker.shutdown()
+            broker.server_close()
+
+        # shutdown() waits out the serve loop's poll; queued ahead of any disconnect
+        self._worker.submit(stop)
 
     # -------------------------
     # Reconnect modal logic
@@ -262,14 +469,13 @@ class MainWindow(QMainWindow):
             self._abort_connection_and_redetect()
 
     def _abort_connection_and_redetect(self) -> None:
+        self._stop_broker()
         if self.device_manager is not None:
-            try:
-                if hasattr(self.device_manager, "disconnect"):
-                    self.device_manager.disconnect()
-            except Exception:
-                pass
+            # Queued ahead of the new autodetect, so the handle is free before it runs
+            self._worker.submit(self.device_manager.disconnect)
 
         self.device_manager = None
+        self.right.set_current_state_text("Not loaded yet.")
 
         self._planned.clear()
         self._render_planned()
@@ -279,6 +485,33 @@ class MainWindow(QMainWindow):
 
         self._startup_autodetect()
 
+    # -------------------------
+    # Apply planned changes
+    # -------------------------
+
+    def _on_confirm_clicked(self) -> None:
+        dm = self.device_manager
+        if dm is None or not dm.connected:
+            QMessageBox.information(self, "Confirm changes", "Connect a device first.")
+            return
+
+        desired = {k: encode(k, v, dm.schema) for k, v in self._planned.values.items()}
+        self.right.set_buttons(plan=False, confirm=False, cancel=False)
+        self._set_status(f"Applying changes to {self._device_display_name()}...", can_reconnect=False)
+        self._worker.submit(lambda: dm.apply(desired), lambda written, error: self._on_apply_done(dm, written, error))
+
+    def _on_apply_done(self, dm: DeviceManager, written: int | None, error: str | None) -> None:
+        if written is None:
+            err = error or dm.last_error or "Unknown error"
+            self._set_planned_mode()
+            self._set_status(f"Apply failed: {err}", can_reconnect=True)
+            return
+
+        self._planned.clear()
+        self._render_planned()
+        self._set_editing_mode()
+        self._set_status(f"Applied {written} change(s) to {self._device_display_name()}.", can_reconnect=True)
+
     # -------------------------
     # Planned rendering
     # -------------------------
@@ -286,8 +519,8 @@ class MainWindow(QMainWindow):
     def _render_planned(self) -> None:
         self.right.set_planned_text(self._planned.render())
 
-    def _set_planned_line(self, key: str, text: str) -> None:
-        self._planned.set_line(key, text)
+    def _set_planned_line(self, key: str, text: str, value: str | None = None) -> None:
+        self._planned.set_line(key, text, value)
         self._render_planned()
 
     # -------------------------
@@ -296,21 +529,21 @@ class MainWindow(QMainWindow):
 
     def _on_monitor_changed(self, inp: str, mode: str) -> None:
         label = MONITORING_INPUT_LABELS.get(inp, inp)
-        self._set_planned_line(inp, f"Monitoring {label}: {mode}")
+        self._set_planned_line(inp, f"Monitoring {label}: {mode}", mode)
 
     def _on_route_changed(self, sel: RouteSelection) -> None:
         source_label = ROUTING_SOURCE_LABELS.get(sel.source, sel.source)
         if sel.dest == "LINE12":
-            self._set_planned_line("LINE12", f"Routing Line 1/2: {source_label}")
+            self._set_planned_line("LINE12", f"Routing Line 1/2: {source_label}", sel.source)
         elif sel.dest == "LINE34":
-            self._set_planned_line("LINE34", f"Routing Line 3/4: {source_label}")
+            self._set_planned_line("LINE34", f"Routing Line 3/4: {source_label}", sel.source)
 
     def _on_input_changed(self, inp: str, mode: str) -> None:
-        self._set_planned_line(inp, f"Input {inp}: {mode}")
+        self._set_planned_line(inp, f"Input {inp}: {mode}", mode)
 
     def _on_powersave_toggled(self, enabled: bool) -> None:
         mode = "ON" if enabled else "OFF"
-        self._set_planned_line("POWERSAVE", f"PowerSave: {mode}")
+        self._set_planned_line("POWERSAVE", f"PowerSave: {mode}", mode)
 
     # -------------------------
     # Modes
@@ -331,6 +564,21 @@ class MainWindow(QMainWindow):
         self.right.set_buttons(plan=False, confirm=False, cancel=False)
         self.status.set_profiles_enabled(False)
 
+    # -------------------------
+    # Debug
+    # -------------------------
+
+    def _show_stats_dialog(self) -> None:
+        if self._transfer_stats is None:
+            stats = self._transfer_stats = TransferStats()
+            dm = self.device_manager
+            if dm is not None:
+                self._worker.submit(lambda: dm.enable_stats(stats))
+        if self._stats_dialog is None:
+            self._stats_dialog = TransferStatsDialog(self._transfer_stats, self)
+        self._stats_dialog.show()
+        self._stats_dialog.raise_()
+
     # -------------------------
     # Status + sizing
     # -------------------------
@@ -351,16 +599,9 @@ class MainWindow(QMainWindow):
 
 
 def main() -> int:
-    app = QApplication(sys.argv)
-
-    qss = Path(__file__).with_name("style.qss")
-    if qss.exists():
-        app.setStyleSheet(qss.read_text(encoding="utf-8"))
-
-    window = MainWindow()
-    window.show()
+    from gui.app import main as app_main
 
-    return app.exec()
+    return app_main()
 
 
 if __name__ == "__main__":
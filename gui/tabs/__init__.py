@@ -1,7 +1,13 @@
-from gui.tabs.routing_tab import RoutingTab
-from gui.tabs.monitoring_tab import MonitoringTab
-from gui.tabs.inputs_tab import InputsTab
-from gui.tabs.powersave_tab import PowerSaveTab
+import importlib
+
+# Tab classes are imported on first use, so importing one tab module (or
+# this package) doesn't pull in every page.
+_TABS = {
+    "RoutingTab": "gui.tabs.routing_tab",
+    "MonitoringTab": "gui.tabs.monitoring_tab",
+    "InputsTab": "gui.tabs.inputs_tab",
+    "PowerSaveTab": "gui.tabs.powersave_tab",
+}
 
 __all__ = [
     "RoutingTab",
@@ -9,3 +15,10 @@ __all__ = [
     "InputsTab",
     "PowerSaveTab",
 ]
+
+
+def __getattr__(name):
+    module = _TABS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
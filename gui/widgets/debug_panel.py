@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import QDialog, QHBoxLayout, QPlainTextEdit, QPushButton, QVBoxLayout, QWidget
+
+from core.instrumentation import TransferStats, format_stats
+
+
+class TransferStatsDialog(QDialog):
+    """Debug panel: live USB transfer statistics table."""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, stats: TransferStats, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._stats = stats
+
+        self.setWindowTitle("USB transfer statistics")
+        self.resize(720, 320)
+
+        layout = QVBoxLayout(self)
+
+        self.table_text = QPlainTextEdit(self)
+        self.table_text.setReadOnly(True)
+        self.table_text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+
+        buttons_row = QWidget(self)
+        buttons_layout = QHBoxLayout(buttons_row)
+        buttons_layout.setContentsMargins(0, 0, 0, 0)
+
+        reset_btn = QPushButton("Reset", buttons_row)
+        close_btn = QPushButton("Close", buttons_row)
+        reset_btn.clicked.connect(self._on_reset_clicked)
+        close_btn.clicked.connect(self.close)
+
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(reset_btn)
+        buttons_layout.addWidget(close_btn)
+
+        layout.addWidget(self.table_text, 1)
+        layout.addWidget(buttons_row, 0)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def refresh(self) -> None:
+        self.table_text.setPlainText(format_stats(self._stats.snapshot()))
+
+    def showEvent(self, event) -> None:
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _on_reset_clicked(self) -> None:
+        self._stats.reset()
+        self.refresh()
@@ -1,5 +1,7 @@
 # gui/widgets/planned_changes.py
 
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 
 
@@ -8,15 +10,21 @@ class PlannedChanges:
     header: str = "Changes you want to make:"
     order: list[str] = field(default_factory=list)
     lines: dict[str, str] = field(default_factory=dict)
+    # CLI-native values per key (e.g. "LINE12" -> "OUT34"), used when applying
+    values: dict[str, str] = field(default_factory=dict)
 
-    def set_line(self, key: str, text: str) -> None:
+    def set_line(self, key: str, text: str, value: str | None = None) -> None:
         self.lines[key] = text
+        if value is not None:
+            self.values[key] = value
 
     def remove(self, key: str) -> None:
         self.lines.pop(key, None)
+        self.values.pop(key, None)
 
     def clear(self) -> None:
         self.lines.clear()
+        self.values.clear()
 
     def render(self) -> str:
         out = [self.header]
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+from typing import Callable
+
 from PySide6.QtWidgets import QStackedWidget, QVBoxLayout, QWidget, QSizePolicy
 
 from .equal_width_tabbar import EqualWidthTabBar
 
 
 class TabsPanel(QWidget):
-    """QTabBar + QStackedWidget (instead of QTabWidget)."""
+    """
+    QTabBar + QStackedWidget (instead of QTabWidget).
+
+    Pages added with add_lazy_tab are built by their factory the first time
+    they are shown; until then the stack holds an empty placeholder.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        # Stack index -> factory of a page not built yet
+        self._factories: dict[int, Callable[[], QWidget]] = {}
+
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
@@ -21,7 +31,7 @@ class TabsPanel(QWidget):
         self.tabbar.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
 
         self.stack = QStackedWidget(self)
-        self.tabbar.currentChanged.connect(self.stack.setCurrentIndex)
+        self.tabbar.currentChanged.connect(self._on_current_changed)
 
         layout.addWidget(self.tabbar)
         layout.addWidget(self.stack, 1)
@@ -30,5 +40,30 @@ class TabsPanel(QWidget):
         self.stack.addWidget(page)
         self.tabbar.addTab(title)
 
+    def add_lazy_tab(self, factory: Callable[[], QWidget], title: str) -> None:
+        index = self.stack.addWidget(QWidget(self.stack))
+        self._factories[index] = factory
+        # The first tab becomes current here, which builds it straight away
+        self.tabbar.addTab(title)
+
+    def page(self, index: int) -> QWidget:
+        """The page at index, built now if it hasn't been."""
+        factory = self._factories.pop(index, None)
+        if factory is not None:
+            placeholder = self.stack.widget(index)
+            self.stack.insertWidget(index, factory())
+            self.stack.removeWidget(placeholder)
+            placeholder.deleteLater()
+        return self.stack.widget(index)
+
+    def is_built(self, index: int) -> bool:
+        return index not in self._factories
+
+    def _on_current_changed(self, index: int) -> None:
+        if index < 0:
+            return
+        self.page(index)
+        self.stack.setCurrentIndex(index)
+
     def min_width_for_titles(self) -> int:
         return max(1, self.tabbar.count()) * self.tabbar.min_tab_width()
@@ -1,3 +1,5 @@
+from core.parameters import DEFAULT_SCHEMA, DeviceSchema, decode
+
 
 MONITORING_INPUT_LABELS: dict[str, str] = {
     "IN12": "Inputs 1/2",
@@ -9,3 +11,25 @@ ROUTING_SOURCE_LABELS: dict[str, str] = {
     "OUT12": "Computer Out 1/2",
     "OUT34": "Computer Out 3/4",
 }
+
+
+ROUTING_DEST_LABELS: dict[str, str] = {
+    "LINE12": "Line 1/2",
+    "LINE34": "Line 3/4",
+}
+
+
+def planned_line(key: str, name: str) -> str:
+    """Planned-changes wording for one parameter set to a CLI-native value name."""
+    if key in ROUTING_DEST_LABELS:
+        return f"Routing {ROUTING_DEST_LABELS[key]}: {ROUTING_SOURCE_LABELS.get(name, name)}"
+    if key in MONITORING_INPUT_LABELS:
+        return f"Monitoring {MONITORING_INPUT_LABELS[key]}: {name}"
+    if key == "POWERSAVE":
+        return f"PowerSave: {name}"
+    return f"Input {key}: {name}"
+
+
+def format_device_state(values: dict[str, int], schema: DeviceSchema = DEFAULT_SCHEMA) -> str:
+    """Render {parameter key: raw value} in the same wording as planned changes."""
+    return "\n".join(planned_line(key, decode(key, value, schema)) for key, value in values.items())
@@ -1,12 +1,9 @@
-import usb.core
-import usb.util
 import argparse
+import signal
+import sys
 
-from route import RouteCommand
-from monitor import MonitorCommand
-from inputs import InputCommand
-from powersave import PowersaveCommand
-from read import ReadCommand
+from cli_core import COMMANDS, get_command_class
+from core.devices import US4X4
 
 VENDOR_ID=0x0644
 PRODUCT_ID = 0x804e
@@ -20,46 +17,6 @@ OUTPUT_LINE34 = 0x0001
 
 # os.environ['PYUSB_DEBUG'] = 'debug'
 
-def get_device():
-    device = usb.core.find(idVendor=VENDOR_ID, idProduct=PRODUCT_ID)
-
-    if device is None:
-        raise ValueError('Device not found')
-
-    return device
-
-def control_device(device, device_config):
-    try:
-        if device.is_kernel_driver_active(0):
-            device.detach_kernel_driver(0)
-        if device.is_kernel_driver_active(1):
-            device.detach_kernel_driver(1)
-        if device.is_kernel_driver_active(2):
-            device.detach_kernel_driver(2)
-        if device.is_kernel_driver_active(3):
-            device.detach_kernel_driver(3)
-        if device.is_kernel_driver_active(4):
-            device.detach_kernel_driver(4)
-        usb.util.claim_interface(device, device_config[(0,0)])
-        usb.util.claim_interface(device, device_config[(1,0)])
-        usb.util.claim_interface(device, device_config[(2,0)])
-        usb.util.claim_interface(device, device_config[(3,0)])
-        usb.util.claim_interface(device, device_config[(4,0)])
-    except usb.USBError as err:
-        print(err)
-
-def release_device(device, device_config):
-    try:
-        usb.util.release_interface(device, device_config[(0,0)])
-        usb.util.release_interface(device, device_config[(1,0)])
-        usb.util.release_interface(device, device_config[(2,0)])
-        usb.util.release_interface(device, device_config[(3,0)])
-        usb.util.release_interface(device, device_config[(4,0)])
-        device.attach_kernel_driver(0)
-    except usb.USBError as err:
-        print(err)
-
-
 def get_output_index(output_name):
     if output_name == "LINE12":
         return OUTPUT_LINE12
@@ -80,37 +37,160 @@ def get_mode_id(mode_name):
         raise ValueError('Invalid argument value for --mode')
 
 def get_command(command, args):
-    if command.lower() == "route":
-        return RouteCommand(args)
-    elif command.lower() == "monitor":
-        return MonitorCommand(args)
-    elif command.lower() == "input":
-        return InputCommand(args)
-    elif command.lower() == "powersave":
-        return PowersaveCommand(args)
-    elif command.lower() == "read":
-        return ReadCommand(args)
+    return get_command_class(command)(args)
+
+def run_daemon(args):
+    """
+    Keep the device claimed and serve transfers on a Unix socket until
+    interrupted, so later CLI calls skip the open/claim/release cycle.
+    """
+    parser = argparse.ArgumentParser(prog="tascam-util.py daemon")
+    from core.handle_server import default_socket_path
+
+    parser.add_argument("-s", "--socket", type=str, default=str(default_socket_path(VENDOR_ID, PRODUCT_ID)),
+                        help="Path of the Unix socket to listen on")
+    parser.add_argument("-r", "--record", type=str, default=None,
+                        help="Record every transfer to this binary log (see core.recording)")
+    parser.add_argument("--stats", action="store_true",
+                        help="Time every transfer, for the stats command")
+    args = parser.parse_args(args)
+
+    from core.handle_server import HandleServer, SocketInUse
+    from core.instrumentation import TransferStats
+    from core.recording import RecordingTransport, TransferLogWriter
+    from core.transport import PyUsbTransport
+
+    log = None
+
+    def open_transport():
+        transport = PyUsbTransport(VENDOR_ID, PRODUCT_ID, US4X4.control_interfaces)
+        return RecordingTransport(transport, log) if log is not None else transport
+
+    try:
+        server = HandleServer(open_transport, args.socket, TransferStats() if args.stats else None)
+    except SocketInUse as e:
+        raise SystemExit(str(e))
+    if args.record:
+        log = TransferLogWriter(args.record)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Serving device on {server.socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if log is not None:
+            log.close()
+        print("Gave up device")
+
+
+def run_api(args):
+    """
+    Connect to the device, poll it, and serve the control API (see
+    core.control_server) until interrupted. CLI calls are served over the
+    same handle on the daemon socket.
+    """
+    parser = argparse.ArgumentParser(prog="tascam-util.py serve")
+    from core.control_server import default_api_socket_path
+
+    parser.add_argument("-s", "--socket", type=str, default=str(default_api_socket_path(VENDOR_ID, PRODUCT_ID)),
+                        help="Path of the Unix socket to serve the API on")
+    parser.add_argument("-i", "--interval", type=float, default=0.25,
+                        help="Fastest polling interval in seconds")
+    parser.add_argument("-d", "--debounce", type=float, default=0.05,
+                        help="Quiet time in seconds before values sent with 'set' are written")
+    args = parser.parse_args(args)
+
+    import threading
+
+    from core.control_server import ControlServer
+    from core.device_manager import DeviceManager
+    from core.handle_server import HandleServer, SocketInUse, default_socket_path
+
+    dm = DeviceManager(US4X4)
+    try:
+        api = ControlServer(dm, args.socket, debounce=args.debounce)
+    except SocketInUse as e:
+        raise SystemExit(str(e))
+    if not dm.connect():
+        api.server_close()
+        raise SystemExit(f"Could not open device: {dm.last_error}")
+
+    try:
+        broker = HandleServer(dm.shared_transport, default_socket_path(VENDOR_ID, PRODUCT_ID))
+    except SocketInUse:
+        # A daemon already serves CLI calls; it will wait for the device lock
+        broker = None
     else:
-        raise ValueError('Unknown command')
+        threading.Thread(target=broker.serve_forever, name="device-broker", daemon=True).start()
+
+    dm.start_polling(interval=args.interval)
+    dm.start_auto_reconnect(
+        listener=lambda event, detail: api.broadcast("device.status", {"event": event, "detail": detail}),
+    )
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Serving control API on {api.socket_path}")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if broker is not None:
+            broker.shutdown()
+            broker.server_close()
+        api.server_close()
+        dm.disconnect()
+        print("Gave up device")
+
 
 def main(arguments):
 
+    if arguments.command.lower() == "daemon":
+        run_daemon(arguments.args)
+        return
+
+    if arguments.command.lower() == "serve":
+        run_api(arguments.args)
+        return
+
     command = get_command(arguments.command, arguments.args)
 
-    device = get_device()
-    device_config = device.get_active_configuration()
-    control_device(device, device_config)
-    print("Got control of device")
+    from core.handle_server import connect_remote, default_socket_path
+    from core.transport import TransportDevice
+
+    # Fast path: a running daemon already holds the device
+    remote = connect_remote(default_socket_path(VENDOR_ID, PRODUCT_ID))
+    if remote is not None:
+        try:
+            command.execute(TransportDevice(remote))
+        finally:
+            remote.close()
+        return
 
-    command.execute(device)
+    from core.transport import PyUsbTransport, TransportError
 
-    release_device(device, device_config)
-    print("Gave up device")
+    # open() takes the device lock, waiting briefly if another process
+    # (another CLI call, a GUI without its broker) holds the unit
+    transport = PyUsbTransport(VENDOR_ID, PRODUCT_ID, US4X4.control_interfaces)
+    try:
+        transport.open()
+    except TransportError as e:
+        raise SystemExit(f"Could not open device: {e}")
+    print("Got control of device", file=sys.stderr)
+
+    try:
+        command.execute(TransportDevice(transport))
+    finally:
+        transport.close()
+        print("Gave up device", file=sys.stderr)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("command", type=str, help="The command to execute")
+    parser.add_argument("command", type=str,
+                        help="The command to execute: " + ", ".join([*COMMANDS, "daemon", "serve"]))
     parser.add_argument('args', nargs=argparse.REMAINDER, help="the args to pass to the command")
     args = parser.parse_args()
     main(args)